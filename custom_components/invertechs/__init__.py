@@ -1,33 +1,57 @@
+import asyncio
+from dataclasses import replace
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from homeassistant.const import CONF_PASSWORD, CONF_EMAIL
 
 from .client import (
     InvertechsApiError,
     InvertechsAuthError,
+    InvertechsCircuitOpenError,
     InvertechsClient,
     InvertechsConnectionError,
     InvertechsError,
 )
 from .const import (
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_PER_SECOND,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
     CONF_REGION,
+    CONF_STAGGER_REQUESTS,
     CONFIG_ENTRY_VERSION,
     DEFAULT_REGION,
     DEVICE_UPDATE_INTERVAL,
     DOMAIN,
     FAST_UPDATE_INTERVAL,
+    STAGGER_WINDOW,
 )
-from .coordinator_data import fetch_fast_power_plants, fetch_full_power_plants
-from .polling import (
-    mark_device_offline_snapshot,
-    should_reduce_device_polling,
-    should_reduce_fast_polling,
-    update_polling_after_fast,
+from .coordinator_data import (
+    InverterDetailsCache,
+    StationFailures,
+    StationTopology,
+    fetch_fast_power_plants,
+    fetch_full_power_plants,
+)
+from .discovery import EntityDiscovery
+from .models import Plant
+from .polling import StationScheduler, update_polling_after_fast
+from .session import (
+    RegionSession,
+    async_acquire_region_session,
+    async_release_region_session,
+)
+from .snapshot import (
+    async_load_snapshot,
+    async_save_snapshot,
+    async_schedule_snapshot_save,
+    create_snapshot_store,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,15 +63,47 @@ def _config_entry_region(entry: ConfigEntry) -> str:
     return entry.options.get(CONF_REGION, entry.data.get(CONF_REGION, DEFAULT_REGION))
 
 
-def _create_client(entry: ConfigEntry, session) -> InvertechsClient:
+def _create_client(entry: ConfigEntry, region_session: RegionSession) -> InvertechsClient:
     return InvertechsClient(
         entry.data[CONF_EMAIL],
         entry.data[CONF_PASSWORD],
-        session,
+        region_session.session,
         region=_config_entry_region(entry),
+        rate_limiter=region_session.rate_limiter,
+        circuit_breaker=region_session.circuit_breaker,
+        request_queue=region_session.request_queue,
     )
 
 
+async def _startup_stations(entry_data: dict) -> list[dict[str, Any]] | None:
+    """Return the station list shared by the first refreshes."""
+    stations_task = entry_data.get("startup_stations")
+    if stations_task is None:
+        return None
+    return await stations_task
+
+
+def _serve_stale(entry_data: dict, cache_key: str, err: Exception) -> list[Plant]:
+    """Return cached plants while the API circuit is open, marking them stale.
+
+    While the circuit is open the client rejects calls without sending them. Plants
+    already stale from a failing station keep their earlier timestamp. The cache itself
+    stays unmarked, so plants skipped after the API recovers are not left stale.
+    """
+    cached = entry_data.get(cache_key)
+    if not cached:
+        raise UpdateFailed(f"Invertechs API unavailable and no cached data: {err}") from err
+    stale_since = entry_data["stale_since"]
+    if cache_key not in stale_since:
+        stale_since[cache_key] = dt_util.utcnow()
+        _LOGGER.debug("Serving cached %s while the API is unavailable", cache_key)
+    since = stale_since[cache_key]
+    return [
+        plant if plant.stale_since is not None else replace(plant, stale_since=since)
+        for plant in cached
+    ]
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate config entries to the latest version."""
     if config_entry.version >= CONFIG_ENTRY_VERSION:
@@ -69,55 +125,109 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    session = aiohttp_client.async_get_clientsession(hass)
-    client = _create_client(entry, session)
+    region = _config_entry_region(entry)
+    region_session = async_acquire_region_session(
+        hass,
+        region,
+        entry.entry_id,
+        entry.options.get(CONF_RATE_LIMIT, API_RATE_LIMIT_PER_SECOND),
+        entry.options.get(CONF_RATE_LIMIT_BURST, API_RATE_LIMIT_BURST),
+    )
+    entry.async_on_unload(
+        lambda: async_release_region_session(hass, region, entry.entry_id)
+    )
+    client = _create_client(entry, region_session)
+    # Open the TLS connection while the snapshot is read from disk.
+    entry.async_create_background_task(hass, client.warm_up(), f"{DOMAIN}_warm_up")
+    store = create_snapshot_store(hass, entry)
+    snapshot = await async_load_snapshot(store, client, entry)
 
-    if not await client.login():
+    if snapshot.get("token"):
+        # Validated by the first request; an expired token triggers a normal re-login.
+        client.token = snapshot["token"]
+    elif not await client.login():
         _LOGGER.error("Failed to login to Invertechs API (%s)", _config_entry_region(entry))
         return False
 
     entry_data: dict = {
         "client": client,
-        "cached_fast_data": None,
-        "cached_device_data": None,
-        "reduced_polling": False,
-        "inverters_online": True,
-        "offline_fast_snapshot_taken": False,
-        "offline_device_snapshot_taken": False,
+        "store": store,
+        "cached_fast_data": snapshot.get("fast"),
+        "cached_device_data": snapshot.get("devices"),
+        "scheduler": StationScheduler(
+            hass,
+            stagger_window=STAGGER_WINDOW if entry.options.get(CONF_STAGGER_REQUESTS) else None,
+        ),
+        "stale_since": {},
+        "station_topology": StationTopology(),
+        "details_cache": InverterDetailsCache(),
+        "fast_station_failures": StationFailures("fast"),
+        "device_station_failures": StationFailures("devices"),
     }
 
+    def _cached_station_ids(cache_key: str) -> list[str]:
+        return [plant.id for plant in entry_data.get(cache_key) or []]
+
     async def async_update_fast():
+        scheduler: StationScheduler = entry_data["scheduler"]
+        poll_modes = scheduler.fast_modes(_cached_station_ids("cached_fast_data"))
         try:
             plants = await fetch_fast_power_plants(
                 client,
                 entry_data.get("cached_fast_data"),
-                reduced_polling=should_reduce_fast_polling(entry_data),
+                poll_modes=poll_modes,
+                start_delays=scheduler.fast_start_delays(poll_modes),
+                stations=await _startup_stations(entry_data),
+                topology=entry_data["station_topology"],
+                failures=entry_data["fast_station_failures"],
             )
         except InvertechsAuthError as err:
             raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
+        except InvertechsCircuitOpenError as err:
+            return _serve_stale(entry_data, "cached_fast_data", err)
         except (InvertechsConnectionError, InvertechsApiError, InvertechsError) as err:
             raise UpdateFailed(f"Error fetching live power plant data: {err}") from err
+        entry_data["stale_since"].pop("cached_fast_data", None)
         entry_data["cached_fast_data"] = plants
         update_polling_after_fast(
-            entry_data, fast_coordinator, device_coordinator, plants
+            entry_data,
+            fast_coordinator,
+            device_coordinator,
+            plants,
+            entry_data["fast_station_failures"].skip_failing(poll_modes),
         )
+        async_schedule_snapshot_save(store, client, entry, entry_data)
         return plants
 
     async def async_update_devices():
-        reduced_polling = should_reduce_device_polling(entry_data)
+        poll_modes = entry_data["scheduler"].device_modes(
+            _cached_station_ids("cached_device_data")
+        )
         try:
             plants = await fetch_full_power_plants(
                 client,
                 entry_data.get("cached_device_data"),
-                reduced_polling=reduced_polling,
+                poll_modes=poll_modes,
+                stations=await _startup_stations(entry_data),
+                topology=entry_data["station_topology"],
+                live_plants=entry_data.get("cached_fast_data"),
+                details_cache=entry_data["details_cache"],
+                snapshot_stations=entry_data["scheduler"].pending_device_snapshots,
+                failures=entry_data["device_station_failures"],
             )
         except InvertechsAuthError as err:
             raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
+        except InvertechsCircuitOpenError as err:
+            return _serve_stale(entry_data, "cached_device_data", err)
         except (InvertechsConnectionError, InvertechsApiError, InvertechsError) as err:
             raise UpdateFailed(f"Error fetching device data: {err}") from err
-        if not reduced_polling:
+        entry_data["stale_since"].pop("cached_device_data", None)
+        entry_data["scheduler"].record_device(
+            plants, entry_data["device_station_failures"].skip_failing(poll_modes)
+        )
+        if plants is not entry_data.get("cached_device_data"):
             entry_data["cached_device_data"] = plants
-            mark_device_offline_snapshot(entry_data)
+            async_schedule_snapshot_save(store, client, entry, entry_data)
         return plants
 
     fast_coordinator = DataUpdateCoordinator(
@@ -138,13 +248,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     device_coordinator = coordinator
 
-    await fast_coordinator.async_config_entry_first_refresh()
-    await device_coordinator.async_config_entry_first_refresh()
+    # Both first refreshes run together and share one station list request.
+    entry_data["startup_stations"] = hass.async_create_task(client.get_stations())
+
+    async def async_first_refreshes(*refreshes) -> None:
+        tasks = [asyncio.ensure_future(refresh) for refresh in refreshes]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Setup is retried with new coordinators; stop the refresh still running.
+            for task in (*tasks, entry_data["startup_stations"]):
+                task.cancel()
+            raise
+        finally:
+            entry_data.pop("startup_stations", None)
+
+    if entry_data["cached_fast_data"] and entry_data["cached_device_data"]:
+        # Warm start: create entities from the stored snapshot and refresh in the background.
+        fast_coordinator.data = entry_data["cached_fast_data"]
+        device_coordinator.data = entry_data["cached_device_data"]
+        entry.async_create_background_task(
+            hass,
+            async_first_refreshes(
+                fast_coordinator.async_refresh(), device_coordinator.async_refresh()
+            ),
+            f"{DOMAIN}_warm_start_refresh",
+        )
+    else:
+        await async_first_refreshes(
+            fast_coordinator.async_config_entry_first_refresh(),
+            device_coordinator.async_config_entry_first_refresh(),
+        )
 
     hass.data.setdefault(DOMAIN, {})
     entry_data["coordinator"] = device_coordinator
     entry_data["fast_coordinator"] = fast_coordinator
     entry_data["power_plant_coordinator"] = fast_coordinator
+    # One discovery pass per topology change, shared by all platforms.
+    entry_data["discovery"] = EntityDiscovery(entry, fast_coordinator, device_coordinator)
+    entry_data["discovery"].async_start()
     hass.data[DOMAIN][entry.entry_id] = entry_data
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -161,6 +303,15 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        await hass.data[DOMAIN][entry.entry_id]["client"].logout()
+        entry_data = hass.data[DOMAIN][entry.entry_id]
+        client = entry_data["client"]
+        await client.logout()
+        # Keep the snapshot for the next start, but not the token logout just invalidated.
+        await async_save_snapshot(entry_data["store"], client, entry, entry_data)
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored snapshot when the config entry is removed."""
+    await create_snapshot_store(hass, entry).async_remove()
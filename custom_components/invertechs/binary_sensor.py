@@ -1,21 +1,18 @@
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .discovery import (
-    EntityDiscoveryState,
     discover_inverter_binary_sensor_entities,
     discover_inverter_live_binary_sensor_entities,
     discover_power_plant_binary_sensor_entities,
 )
 from .entity import (
+    InvertechsCoordinatorEntity,
+    get_inverter,
     get_live_inverter,
-    get_inverter_wn,
     get_power_plant,
-    get_power_plant_value,
-    power_plant_device_info,
 )
 
 BINARY_SENSOR_ON_VALUES: dict[str, bool | int] = {
@@ -28,33 +25,17 @@ BINARY_SENSOR_ON_VALUES: dict[str, bool | int] = {
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     """Set up Invertechs binary sensors."""
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    coordinator = entry_data["coordinator"]
-    fast_coordinator = entry_data["fast_coordinator"]
-    discovery_state = EntityDiscoveryState()
-
-    @callback
-    def _add_fast_entities() -> None:
-        entities = [
-            *discover_power_plant_binary_sensor_entities(fast_coordinator, entry, discovery_state),
-            *discover_inverter_live_binary_sensor_entities(fast_coordinator, entry, discovery_state),
-        ]
-        if entities:
-            async_add_entities(entities)
-
-    @callback
-    def _add_device_entities() -> None:
-        entities = discover_inverter_binary_sensor_entities(coordinator, entry, discovery_state)
-        if entities:
-            async_add_entities(entities)
-
-    _add_fast_entities()
-    _add_device_entities()
-    entry.async_on_unload(fast_coordinator.async_add_listener(_add_fast_entities))
-    entry.async_on_unload(coordinator.async_add_listener(_add_device_entities))
-
-
-class InvertechsPowerPlantBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    hass.data[DOMAIN][entry.entry_id]["discovery"].async_add_platform(
+        async_add_entities,
+        fast=(
+            discover_power_plant_binary_sensor_entities,
+            discover_inverter_live_binary_sensor_entities,
+        ),
+        devices=(discover_inverter_binary_sensor_entities,),
+    )
+
+
+class InvertechsPowerPlantBinarySensor(InvertechsCoordinatorEntity, BinarySensorEntity):
     """Binary sensor for a power plant."""
 
     _attr_has_entity_name = True
@@ -64,22 +45,23 @@ class InvertechsPowerPlantBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self,
         coordinator,
         entry: ConfigEntry,
-        power_plant: dict,
+        power_plant_id: str,
+        device_info,
         description: BinarySensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self.entity_description = description
-        self._power_plant_id = power_plant["id"]
+        self._power_plant_id = power_plant_id
         self._on_value = BINARY_SENSOR_ON_VALUES[description.key]
-        self._attr_unique_id = f"{entry.entry_id}_{power_plant['id']}_{description.key}"
-        self._attr_device_info = power_plant_device_info(power_plant)
+        self._attr_unique_id = f"{entry.entry_id}_{power_plant_id}_{description.key}"
+        self._attr_device_info = device_info
 
     @property
     def is_on(self) -> bool:
         power_plant = get_power_plant(self.coordinator, self._power_plant_id)
         if not power_plant:
             return False
-        value = get_power_plant_value(power_plant, self.entity_description.key)
+        value = power_plant.metric(self.entity_description.key)
         return value == self._on_value if value is not None else False
 
 
@@ -92,16 +74,17 @@ class InvertechsPowerPlantStatusBinarySensor(InvertechsPowerPlantBinarySensor):
         if not power_plant:
             return None
         return {
-            "creation_time": power_plant.get("createTime"),
-            "plant_address": power_plant.get("stationAddress"),
-            "capacity": power_plant.get("capacity"),
-            "inverters_count": power_plant.get("wnNum"),
-            "meter_exists": bool(power_plant.get("existsMeter")),
-            "battery_exists": bool(power_plant.get("existsBattery")),
+            "creation_time": power_plant.create_time,
+            "plant_address": power_plant.address,
+            "capacity": power_plant.capacity,
+            "inverters_count": power_plant.wn_num,
+            "meter_exists": bool(power_plant.exists_meter),
+            "battery_exists": bool(power_plant.exists_battery),
+            "data_stale_since": power_plant.stale_since,
         }
 
 
-class InvertechsInverterLiveBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class InvertechsInverterLiveBinarySensor(InvertechsCoordinatorEntity, BinarySensorEntity):
     """Inverter connection binary sensor from live IoT data."""
 
     _attr_has_entity_name = True
@@ -126,17 +109,14 @@ class InvertechsInverterLiveBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool:
-        power_plant = get_power_plant(self.coordinator, self._power_plant_id)
-        if not power_plant:
-            return False
-        wn = get_live_inverter(power_plant, self._wn_id)
+        wn = get_live_inverter(self.coordinator, self._power_plant_id, self._wn_id)
         if not wn:
             return False
-        value = wn.get(self.entity_description.key)
+        value = wn.online_status
         return value == self._on_value if value is not None else False
 
 
-class InvertechsInverterBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class InvertechsInverterBinarySensor(InvertechsCoordinatorEntity, BinarySensorEntity):
     """Binary sensor for an inverter from detail polling."""
 
     _attr_has_entity_name = True
@@ -161,11 +141,10 @@ class InvertechsInverterBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool:
-        wn = get_inverter_wn(self.coordinator, self._power_plant_id, self._wn_id)
-        if not wn:
+        inverter = get_inverter(self.coordinator, self._power_plant_id, self._wn_id)
+        if not inverter:
             return False
-        details = wn.get("details", {})
-        value = details.get(self.entity_description.key, wn.get(self.entity_description.key))
+        value = inverter.reading(self.entity_description.key)
         return value == self._on_value if value is not None else False
 
 
@@ -174,17 +153,19 @@ class InvertechsInverterStatusBinarySensor(InvertechsInverterBinarySensor):
 
     @property
     def extra_state_attributes(self) -> dict | None:
-        wn = get_inverter_wn(self.coordinator, self._power_plant_id, self._wn_id)
-        if not wn:
+        inverter = get_inverter(self.coordinator, self._power_plant_id, self._wn_id)
+        if not inverter:
             return None
-        details = wn.get("details", {})
-        pd_month = wn.get("pdMonth", "")
+        details = inverter.details
+        pd_month = inverter.pd_month
+        power_plant = get_power_plant(self.coordinator, self._power_plant_id)
         return {
-            "plant_name": details.get("stationName"),
+            "plant_name": details.station_name if details else None,
             "production_month": (
                 f"{pd_month[:-2]}-{pd_month[-2:]}" if len(pd_month) >= 2 else ""
             ),
-            "valid_thru": wn.get("validDate"),
-            "rated_power": details.get("ratedPower"),
-            "inverter_type": details.get("wnType"),
+            "valid_thru": inverter.valid_date,
+            "rated_power": details.rated_power if details else None,
+            "inverter_type": details.wn_type if details else None,
+            "data_stale_since": power_plant.stale_since if power_plant else None,
         }
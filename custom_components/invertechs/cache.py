@@ -0,0 +1,79 @@
+"""Size-bounded TTL cache for Invertechs API responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters exposed through diagnostics."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    path: str
+    payload: dict[str, Any]
+    value: Any
+
+
+class ResponseCache:
+    """LRU cache of parsed responses; every entry carries its own expiry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (hit, value); the value is shared and must not be changed."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.stats.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        path: str,
+        payload: dict[str, Any],
+        value: Any,
+        ttl: float,
+    ) -> None:
+        """Store value for ttl seconds, evicting the least recently used entry."""
+        self._entries[key] = _CacheEntry(time.monotonic() + ttl, path, payload, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, path: str | None = None, **fields: Any) -> int:
+        """Drop entries for path (all paths when None) whose payload matches fields."""
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if (path is None or entry.path == path)
+            and all(entry.payload.get(name) == value for name, value in fields.items())
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.stats.invalidations += len(stale)
+        return len(stale)
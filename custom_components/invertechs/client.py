@@ -2,23 +2,81 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+import json
 import logging
+import math
 from typing import Any
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+from .cache import ResponseCache
 from .const import (
     API_AUTH_ERROR_CODES,
     API_BASE_URLS,
+    API_CACHE_MAX_ENTRIES,
+    API_CACHE_TTLS,
+    API_CONNECT_TIMEOUT,
+    API_ENDPOINT_TIMEOUTS,
+    API_MAX_CONCURRENT_PAGES,
+    API_MAX_CONCURRENT_REQUESTS,
     API_PAGE_SIZE,
+    API_PRIORITY_CLASS_LIMITS,
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_PER_SECOND,
+    API_RETRY_ATTEMPTS,
     API_SUCCESS_CODE,
     API_TIMEOUT,
     DEFAULT_REGION,
-    POWER_LIMIT_PARAM_CODE,
 )
+from .priority import PriorityRequestQueue, priority_for_path
+from .rate_limit import TokenBucket
+from .resilience import CircuitBreaker, backoff_delay
 
 _LOGGER = logging.getLogger(__name__)
 
+STATIONS_PATH = "app/station/UI2Page"
+STATIONS_PAYLOAD: dict[str, Any] = {
+    "searchValue": None,
+    "collected": 0,
+    "sortType": 0,
+    "status": 0,
+    "stationType": None,
+    "existsOwner": None,
+}
+DEVICES_PATH = "app/station/getDevicesListInsideStation"
+INVERTER_DETAILS_PATH = "app/wnData/getWnDataDetails"
+
+
+if orjson is not None:
+
+    def _json_dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload)
+
+    def _json_loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+    def _canonical_json(payload: Any) -> bytes:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+else:
+
+    def _json_dumps(payload: Any) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def _json_loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
+    def _canonical_json(payload: Any) -> bytes:
+        return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
 
 class InvertechsError(Exception):
     """Base exception for Invertechs client errors."""
@@ -28,6 +86,10 @@ class InvertechsConnectionError(InvertechsError):
     """Raised when the API cannot be reached."""
 
 
+class InvertechsCircuitOpenError(InvertechsConnectionError):
+    """Raised without a request while the region's circuit breaker is open."""
+
+
 class InvertechsAuthError(InvertechsError):
     """Raised when authentication fails."""
 
@@ -40,8 +102,20 @@ class InvertechsApiError(InvertechsError):
         self.code = code
 
 
+@dataclass
+class ClientStats:
+    """Request counters exposed through diagnostics."""
+
+    http_requests: int = 0
+    coalesced_requests: int = 0
+
+
 class InvertechsClient:
-    """Client for the Invertechs cloud API."""
+    """Client for the Invertechs cloud API.
+
+    Config entries of one region pass in the rate limiter, circuit breaker and request
+    queue they share; a client without them gets its own.
+    """
 
     def __init__(
         self,
@@ -49,6 +123,10 @@ class InvertechsClient:
         password: str,
         session: aiohttp.ClientSession,
         region: str = DEFAULT_REGION,
+        *,
+        rate_limiter: TokenBucket | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        request_queue: PriorityRequestQueue | None = None,
     ) -> None:
         self.email = email
         self.password = password
@@ -56,21 +134,49 @@ class InvertechsClient:
         self.region = region if region in API_BASE_URLS else DEFAULT_REGION
         self.token: str | None = None
         self.user_data: dict[str, Any] | None = None
+        self._login_task: asyncio.Future[None] | None = None
+        self._in_flight: dict[tuple[str, bytes, str | None], asyncio.Future[Any]] = {}
+        self.stats = ClientStats()
+        self.cache = ResponseCache(API_CACHE_MAX_ENTRIES)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(self.region)
+        self.rate_limiter = rate_limiter or TokenBucket(
+            API_RATE_LIMIT_PER_SECOND, API_RATE_LIMIT_BURST
+        )
+        self.request_queue = request_queue or PriorityRequestQueue(
+            API_MAX_CONCURRENT_REQUESTS, API_PRIORITY_CLASS_LIMITS
+        )
         self.base_url = API_BASE_URLS[self.region]
         self.headers = {
             "App-Type": "Inver",
             "Lang-Type": "en_US",
             "Content-Type": "application/json",
         }
+        self._auth_headers: dict[str, str] = self.headers
+        self._auth_headers_token: str | None = None
+        self._default_timeout = aiohttp.ClientTimeout(
+            total=API_TIMEOUT, connect=API_CONNECT_TIMEOUT
+        )
+        self._timeouts = {
+            path: aiohttp.ClientTimeout(total=seconds, connect=API_CONNECT_TIMEOUT)
+            for path, seconds in API_ENDPOINT_TIMEOUTS.items()
+        }
 
     async def login(self) -> bool:
         """Authenticate and store the session token."""
         try:
-            await self._authenticate()
+            await self._login_once()
             return True
         except InvertechsAuthError:
             return False
 
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the API host before the first real request."""
+        try:
+            async with self.session.head(self.base_url, timeout=self._default_timeout):
+                pass
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Connection warm-up to %s failed: %s", self.base_url, err)
+
     async def logout(self) -> bool:
         """Invalidate the session token."""
         if not self.token:
@@ -87,17 +193,11 @@ class InvertechsClient:
 
     async def get_stations(self) -> list[dict[str, Any]]:
         """Return all power plants from the station API."""
-        return await self._fetch_paginated_rows(
-            "app/station/UI2Page",
-            {
-                "searchValue": None,
-                "collected": 0,
-                "sortType": 0,
-                "status": 0,
-                "stationType": None,
-                "existsOwner": None,
-            },
-        )
+        return await self._fetch_paginated_rows(STATIONS_PATH, STATIONS_PAYLOAD)
+
+    def iter_stations(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield power plants as each page arrives (page order is not kept)."""
+        return self._iter_paginated_rows(STATIONS_PATH, STATIONS_PAYLOAD)
 
     async def get_station_details(self, station_id: str) -> dict[str, Any]:
         """Return power plant details (API stationId)."""
@@ -106,6 +206,7 @@ class InvertechsClient:
             {"stationId": station_id},
             auth=True,
             data_key="data",
+            coalesce=True,
         )
 
     async def refresh_station_details(self, station_id: str) -> dict[str, Any]:
@@ -115,6 +216,7 @@ class InvertechsClient:
             {"stationId": station_id},
             auth=True,
             data_key="data",
+            coalesce=True,
         )
 
     async def get_station_wn_power_info(self, station_id: str) -> dict[str, Any]:
@@ -124,25 +226,27 @@ class InvertechsClient:
             {"id": station_id},
             auth=True,
             data_key="data",
+            coalesce=True,
         )
 
     async def get_devices_in_station(self, station_id: str) -> list[dict[str, Any]]:
         """Return all devices inside a power plant (API powerStationId)."""
         return await self._fetch_paginated_rows(
-            "app/station/getDevicesListInsideStation",
-            {
-                "searchType": None,
-                "powerStationId": station_id,
-            },
+            DEVICES_PATH, _devices_payload(station_id)
         )
 
+    def iter_devices_in_station(self, station_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield devices inside a power plant as each page arrives."""
+        return self._iter_paginated_rows(DEVICES_PATH, _devices_payload(station_id))
+
     async def get_inverter_details(self, wn_id: str, station_id: str) -> dict[str, Any]:
         """Return inverter details (API wnId / stationId)."""
         return await self._post(
-            "app/wnData/getWnDataDetails",
+            INVERTER_DETAILS_PATH,
             {"wnId": wn_id, "stationId": station_id},
             auth=True,
             data_key="data",
+            coalesce=True,
         )
 
     async def set_inverter_power_percent(self, wn_id: str, percent: float) -> None:
@@ -153,21 +257,9 @@ class InvertechsClient:
             auth=True,
         )
 
-    @staticmethod
-    def get_inverter_power_limit_percent(
-        live_data: dict[str, Any] | None, wn_id: str
-    ) -> float | None:
-        """Read power limit percent from live IoT payload (param code 72)."""
-        if not live_data:
-            return None
-        for param in live_data.get("iotWnParams", []):
-            if (
-                param.get("wnId") == wn_id
-                and str(param.get("paramCode")) == POWER_LIMIT_PARAM_CODE
-            ):
-                value = param.get("paramValue")
-                return float(value) if value is not None else None
-        return None
+    def invalidate_cache(self, path: str | None = None, **payload_fields: Any) -> int:
+        """Drop cached responses for path whose request payload matches payload_fields."""
+        return self.cache.invalidate(path, **payload_fields)
 
     async def _authenticate(self) -> None:
         """Log in and set the token."""
@@ -189,43 +281,129 @@ class InvertechsClient:
         self.token = data["token"]
         self.user_data = data
 
+    async def _login_once(self) -> None:
+        """Log in, joining a login that is already in flight."""
+        if self._login_task is None:
+            self._login_task = asyncio.ensure_future(self._authenticate())
+            self._login_task.add_done_callback(self._clear_login_task)
+        # Shield so a cancelled caller does not abort the login other callers wait on.
+        await asyncio.shield(self._login_task)
+
+    def _clear_login_task(self, task: asyncio.Future[None]) -> None:
+        if self._login_task is task:
+            self._login_task = None
+
+    async def _refresh_token(self, stale_token: str | None) -> None:
+        """Replace an expired token once, however many requests saw it fail."""
+        if self.token and self.token != stale_token:
+            # Another request already logged in again after this one was sent.
+            return
+        await self._login_once()
+
     async def _ensure_token(self) -> None:
         if not self.token:
-            await self._authenticate()
+            await self._login_once()
 
     async def _fetch_paginated_rows(
         self,
         path: str,
         payload: dict[str, Any],
     ) -> list[dict[str, Any]]:
-        """Fetch all pages of a list endpoint."""
-        rows: list[dict[str, Any]] = []
-        page_num = 1
+        """Fetch all pages of a list endpoint, keeping page order."""
+        rows, total = await self._fetch_page(path, payload, 1)
+        page_nums = _remaining_page_numbers(len(rows), total)
+        if page_nums is None:
+            rows.extend(await self._fetch_following_pages(path, payload, len(rows)))
+            return rows
+
+        tasks = self._start_page_tasks(path, payload, page_nums)
+        try:
+            for page_rows in await asyncio.gather(*tasks):
+                rows.extend(page_rows)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return rows
 
-        while True:
-            page_payload = {
-                **payload,
-                "queryQo": {"pageNum": page_num, "pageSize": API_PAGE_SIZE},
-            }
-            response = await self._post(path, page_payload, auth=True)
-            if not isinstance(response, dict):
-                raise InvertechsApiError(f"Unexpected paginated response for {path}")
+    async def _iter_paginated_rows(
+        self,
+        path: str,
+        payload: dict[str, Any],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield rows of a list endpoint as each page arrives."""
+        rows, total = await self._fetch_page(path, payload, 1)
+        for row in rows:
+            yield row
+
+        page_nums = _remaining_page_numbers(len(rows), total)
+        if page_nums is None:
+            for row in await self._fetch_following_pages(path, payload, len(rows)):
+                yield row
+            return
+
+        tasks = self._start_page_tasks(path, payload, page_nums)
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                for row in await next_page:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _start_page_tasks(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        page_nums: range,
+    ) -> list[asyncio.Future[list[dict[str, Any]]]]:
+        """Schedule page fetches with at most API_MAX_CONCURRENT_PAGES in flight."""
+        semaphore = asyncio.Semaphore(API_MAX_CONCURRENT_PAGES)
+
+        async def _fetch(page_num: int) -> list[dict[str, Any]]:
+            async with semaphore:
+                page_rows, _ = await self._fetch_page(path, payload, page_num)
+                return page_rows
 
-            page_rows = response.get("rows", [])
-            if not isinstance(page_rows, list):
-                raise InvertechsApiError(f"Unexpected rows payload for {path}")
+        return [asyncio.ensure_future(_fetch(page_num)) for page_num in page_nums]
 
+    async def _fetch_following_pages(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        first_page_len: int,
+    ) -> list[dict[str, Any]]:
+        """Fetch pages after the first one by one; used when the API reports no total."""
+        rows: list[dict[str, Any]] = []
+        page_len = first_page_len
+        page_num = 1
+        while page_len >= API_PAGE_SIZE:
+            page_num += 1
+            page_rows, _ = await self._fetch_page(path, payload, page_num)
             rows.extend(page_rows)
+            page_len = len(page_rows)
+        return rows
 
-            total = response.get("total")
-            if isinstance(total, int) and len(rows) >= total:
-                break
-            if len(page_rows) < API_PAGE_SIZE:
-                break
+    async def _fetch_page(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        page_num: int,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Fetch one page of a list endpoint and return its rows and the row total."""
+        page_payload = {
+            **payload,
+            "queryQo": {"pageNum": page_num, "pageSize": API_PAGE_SIZE},
+        }
+        response = await self._post(path, page_payload, auth=True, coalesce=True)
+        if not isinstance(response, dict):
+            raise InvertechsApiError(f"Unexpected paginated response for {path}")
 
-            page_num += 1
+        page_rows = response.get("rows", [])
+        if not isinstance(page_rows, list):
+            raise InvertechsApiError(f"Unexpected rows payload for {path}")
 
-        return rows
+        total = response.get("total")
+        return page_rows, total if isinstance(total, int) else None
 
     async def _post(
         self,
@@ -235,19 +413,84 @@ class InvertechsClient:
         auth: bool,
         data_key: str | None = None,
         allow_retry: bool = True,
+        coalesce: bool = False,
+    ) -> Any:
+        """POST to the API.
+
+        Coalesced reads are served from the response cache when the endpoint has a TTL,
+        and identical ones in flight share one HTTP call.
+        """
+        if not coalesce:
+            return await self._post_with_retry(
+                path, payload, auth=auth, data_key=data_key, allow_retry=allow_retry
+            )
+
+        key = (path, _canonical_json(payload), data_key)
+        cache_ttl = API_CACHE_TTLS.get(path)
+        if cache_ttl:
+            hit, cached = self.cache.get(key)
+            if hit:
+                return cached
+
+        if (in_flight := self._in_flight.get(key)) is not None:
+            self.stats.coalesced_requests += 1
+            # Responses are parsed into frozen models and never changed, so callers share them.
+            return await asyncio.shield(in_flight)
+
+        in_flight = asyncio.ensure_future(
+            self._post_with_retry(
+                path, payload, auth=auth, data_key=data_key, allow_retry=allow_retry
+            )
+        )
+        if cache_ttl:
+            in_flight.add_done_callback(
+                lambda future: self._cache_result(key, path, payload, future, cache_ttl)
+            )
+        self._in_flight[key] = in_flight
+        in_flight.add_done_callback(lambda future: self._finish_in_flight(key, future))
+        return await asyncio.shield(in_flight)
+
+    def _finish_in_flight(
+        self, key: tuple[str, bytes, str | None], in_flight: asyncio.Future[Any]
+    ) -> None:
+        if self._in_flight.get(key) is in_flight:
+            del self._in_flight[key]
+        if not in_flight.cancelled():
+            # Mark the error retrieved when every caller was cancelled.
+            in_flight.exception()
+
+    def _cache_result(
+        self,
+        key: tuple[str, bytes, str | None],
+        path: str,
+        payload: dict[str, Any],
+        future: asyncio.Future[Any],
+        ttl: int,
+    ) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.cache.set(key, path, payload, future.result(), ttl)
+
+    async def _post_with_retry(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        *,
+        auth: bool,
+        data_key: str | None,
+        allow_retry: bool,
     ) -> Any:
         """POST to the API with optional auth retry."""
         if auth:
             await self._ensure_token()
 
         for attempt in range(2):
+            sent_token = self.token
             try:
-                body = await self._request(path, payload, auth=auth)
+                body = await self._send(path, payload, auth=auth)
             except InvertechsAuthError:
                 if not allow_retry or attempt == 1:
                     raise
-                self.token = None
-                await self._authenticate()
+                await self._refresh_token(sent_token)
                 continue
 
             api_code = body.get("code")
@@ -263,8 +506,7 @@ class InvertechsClient:
                 and api_code in API_AUTH_ERROR_CODES
             ):
                 _LOGGER.debug("API auth error (code %s), re-authenticating", api_code)
-                self.token = None
-                await self._authenticate()
+                await self._refresh_token(sent_token)
                 continue
 
             message = body.get("msg") or body.get("message") or "Unknown API error"
@@ -274,6 +516,59 @@ class InvertechsClient:
 
         raise InvertechsAuthError("Authentication failed after retry")
 
+    async def _send(
+        self,
+        path: str,
+        payload: dict[str, Any],
+        *,
+        auth: bool,
+    ) -> dict[str, Any]:
+        """Send through the region's circuit breaker, retrying transient errors with backoff.
+
+        Every attempt first waits for a slot of the endpoint's class in the region's
+        priority queue, then for a token from the region's rate limiter.
+        """
+        breaker = self.circuit_breaker
+        priority = priority_for_path(path)
+        for attempt in range(API_RETRY_ATTEMPTS):
+            async with self.request_queue.slot(priority):
+                await self.rate_limiter.acquire()
+                if not breaker.allow_request():
+                    raise InvertechsCircuitOpenError(
+                        f"Invertechs API ({self.region}) paused after repeated failures"
+                    )
+                try:
+                    body = await self._request(path, payload, auth=auth)
+                except InvertechsConnectionError as err:
+                    breaker.record_failure()
+                    if attempt + 1 == API_RETRY_ATTEMPTS or breaker.is_open:
+                        raise
+                    delay = backoff_delay(attempt)
+                    _LOGGER.debug("%s failed (%s); retrying in %.1f s", path, err, delay)
+                except InvertechsError:
+                    # The API answered, so it is reachable.
+                    breaker.record_success()
+                    raise
+                except BaseException:
+                    breaker.release_trial()
+                    raise
+                else:
+                    breaker.record_success()
+                    return body
+            # The backoff does not hold a request slot.
+            await asyncio.sleep(delay)
+
+        raise InvertechsConnectionError(f"No attempts left for {path}")
+
+    def _request_headers(self, auth: bool) -> dict[str, str]:
+        """Return request headers, rebuilding the auth variant only when the token changes."""
+        if not (auth and self.token):
+            return self.headers
+        if self._auth_headers_token != self.token:
+            self._auth_headers = {**self.headers, "Authorization": self.token}
+            self._auth_headers_token = self.token
+        return self._auth_headers
+
     async def _request(
         self,
         path: str,
@@ -282,38 +577,54 @@ class InvertechsClient:
         auth: bool,
     ) -> dict[str, Any]:
         """Execute an HTTP POST and return the parsed JSON body."""
-        url = f"{self.base_url}{path}"
-        headers = dict(self.headers)
-        if auth and self.token:
-            headers["Authorization"] = self.token
-
+        self.stats.http_requests += 1
         try:
             async with self.session.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+                f"{self.base_url}{path}",
+                data=_json_dumps(payload),
+                headers=self._request_headers(auth),
+                timeout=self._timeouts.get(path, self._default_timeout),
             ) as response:
                 if response.status in {401, 403}:
                     raise InvertechsAuthError(
                         f"HTTP {response.status} from Invertechs API"
                     )
-                if response.status >= 400:
+                if response.status == 429 or response.status >= 500:
                     raise InvertechsConnectionError(
                         f"HTTP {response.status} from Invertechs API"
                     )
-                try:
-                    body = await response.json()
-                except aiohttp.ContentTypeError as err:
-                    raise InvertechsConnectionError(
-                        "Invalid response from Invertechs API"
-                    ) from err
+                if response.status >= 400:
+                    raise InvertechsApiError(
+                        f"HTTP {response.status} from Invertechs API",
+                        code=response.status,
+                    )
+                raw = await response.read()
         except aiohttp.ClientError as err:
             raise InvertechsConnectionError(
                 f"Could not connect to Invertechs API: {err}"
             ) from err
+        except TimeoutError as err:
+            raise InvertechsConnectionError("Timeout talking to Invertechs API") from err
+
+        try:
+            body = _json_loads(raw)
+        except ValueError as err:
+            raise InvertechsConnectionError("Invalid response from Invertechs API") from err
 
         if not isinstance(body, dict):
             raise InvertechsApiError("Unexpected API response format")
 
         return body
+
+
+def _devices_payload(station_id: str) -> dict[str, Any]:
+    return {"searchType": None, "powerStationId": station_id}
+
+
+def _remaining_page_numbers(first_page_len: int, total: int | None) -> range | None:
+    """Return the pages still to fetch after page 1, or None when the total is unknown."""
+    if first_page_len < API_PAGE_SIZE or (total is not None and first_page_len >= total):
+        return range(0)
+    if total is None:
+        return None
+    return range(2, math.ceil(total / API_PAGE_SIZE) + 1)
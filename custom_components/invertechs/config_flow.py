@@ -14,7 +14,13 @@ from .client import (
     InvertechsError,
 )
 from .const import (
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_MAX,
+    API_RATE_LIMIT_PER_SECOND,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
     CONF_REGION,
+    CONF_STAGGER_REQUESTS,
     CONFIG_ENTRY_VERSION,
     DEFAULT_REGION,
     DOMAIN,
@@ -186,6 +192,43 @@ class InvertechsOptionsFlowHandler(config_entries.OptionsFlow):
                             mode=selector.SelectSelectorMode.DROPDOWN,
                         ),
                     ),
+                    vol.Required(
+                        CONF_STAGGER_REQUESTS,
+                        default=self._config_entry.options.get(CONF_STAGGER_REQUESTS, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_RATE_LIMIT,
+                        default=self._config_entry.options.get(
+                            CONF_RATE_LIMIT, API_RATE_LIMIT_PER_SECOND
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=API_RATE_LIMIT_MAX,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="req/s",
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_RATE_LIMIT_BURST,
+                        default=self._config_entry.options.get(
+                            CONF_RATE_LIMIT_BURST, API_RATE_LIMIT_BURST
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=2 * API_RATE_LIMIT_MAX,
+                                step=1,
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
                 }
             ),
         )
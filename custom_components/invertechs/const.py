@@ -3,6 +3,9 @@ from datetime import timedelta
 DOMAIN = "invertechs"
 
 CONF_REGION = "region"
+CONF_STAGGER_REQUESTS = "stagger_requests"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
 
 REGION_EU = "eu"
 REGION_CN = "cn"
@@ -10,20 +13,111 @@ DEFAULT_REGION = REGION_EU
 
 CONFIG_ENTRY_VERSION = 2
 
+# Persisted session token and last coordinator data, used to start without waiting for the API.
+SNAPSHOT_STORAGE_VERSION = 2
+# Like Home Assistant's restore state, write at most every 15 minutes; a pending save is
+# flushed on shutdown and the snapshot is also written when an entry unloads.
+SNAPSHOT_SAVE_DELAY = 900
+
 API_BASE_URLS = {
     REGION_EU: "https://appeu.invertechs.com/cniotapi/",
     REGION_CN: "https://appcn.invertechs.com/cniotapi/",
 }
 
+# Request timeouts (seconds): API_TIMEOUT applies to endpoints missing from the table.
 API_TIMEOUT = 30
+API_CONNECT_TIMEOUT = 10
+API_ENDPOINT_TIMEOUTS: dict[str, int] = {
+    "app/user/login": 15,
+    "app/station/refreshStationDataDetails": 10,
+    "iot/station/getStationWnPowerInfo": 10,
+    "app/station/UI2Page": 20,
+    "app/station/getDevicesListInsideStation": 20,
+    "app/wnData/getWnDataDetails": 15,
+    "app/wn/editPowerPercent": 15,
+}
+# Pooled HTTP session per region.
+API_CONNECTION_LIMIT = 20
+API_DNS_CACHE_TTL = 300
+API_KEEPALIVE_TIMEOUT = 60
+# Retries for transient errors use capped exponential backoff with full jitter (seconds).
+API_RETRY_ATTEMPTS = 3
+API_BACKOFF_BASE = 1
+API_BACKOFF_MAX = 10
+# Per-region circuit breaker: consecutive failures before opening, open time bounds (seconds).
+API_CIRCUIT_FAILURE_THRESHOLD = 5
+API_CIRCUIT_OPEN_MIN = 60
+API_CIRCUIT_OPEN_MAX = 900
+# Per-region token bucket shared by all entries: default sustained requests per second and
+# burst size, overridable per entry (the region uses the highest). A 60-station account
+# needs about 4 requests per second for the fast cycle plus 4 for inverter details.
+API_RATE_LIMIT_PER_SECOND = 10
+API_RATE_LIMIT_BURST = 20
+API_RATE_LIMIT_MAX = 50
+# Per-region request priority queue: requests in flight in total and per class (writes
+# and login, live power info, station refresh and list, details and device lists), and
+# the wait (seconds) after which a queued request moves up one class.
+API_MAX_CONCURRENT_REQUESTS = 8
+API_PRIORITY_CLASS_LIMITS = (4, 8, 6, 4)
+API_PRIORITY_AGING = 5
+# Endpoint request classes (0 is served first); endpoints missing here are class 3.
+API_ENDPOINT_PRIORITIES: dict[str, int] = {
+    "app/user/login": 0,
+    "app/wn/editPowerPercent": 0,
+    "iot/station/getStationWnPowerInfo": 1,
+    "app/station/refreshStationDataDetails": 2,
+    "app/station/UI2Page": 2,
+}
 API_PAGE_SIZE = 100
+# Upper bound on list pages requested at the same time once the row total is known.
+API_MAX_CONCURRENT_PAGES = 4
 API_SUCCESS_CODE = 200
 API_AUTH_ERROR_CODES = frozenset({401, 403})
 
+# Client-side response cache: seconds each endpoint's response is reused.
+API_CACHE_MAX_ENTRIES = 1024
+API_CACHE_TTLS: dict[str, int] = {
+    "app/station/getStationDataDetails": 3600,
+    "app/station/getDevicesListInsideStation": 900,
+    # Also carries live readings, so only long enough to absorb back-to-back refreshes.
+    "app/wnData/getWnDataDetails": 60,
+}
+
+# Upper bound on stations refreshed at the same time within one coordinator cycle.
+MAX_CONCURRENT_STATION_REQUESTS = 8
+# Upper bound on inverter detail requests in flight across all stations.
+MAX_CONCURRENT_DETAIL_REQUESTS = 8
+
 # App polling: getStationWnPowerInfo ~every 2–12 s; refreshStationDataDetails on overview.
 FAST_UPDATE_INTERVAL = timedelta(seconds=30)
 OFFLINE_UPDATE_INTERVAL = timedelta(minutes=5)
 DEVICE_UPDATE_INTERVAL = timedelta(minutes=5)
+# Offline IoT probes back off exponentially from OFFLINE_UPDATE_INTERVAL up to this by day.
+OFFLINE_PROBE_MAX_INTERVAL = timedelta(minutes=30)
+# Consecutive readings needed before a station is treated as online or offline.
+CONNECTIVITY_HYSTERESIS_READINGS = 3
+# Night scheduling from the Home Assistant location: offline probes back off up to
+# NIGHT_PROBE_MAX_INTERVAL, then run every DAWN_PROBE_INTERVAL from DAWN_PREWARM before
+# sunrise until DAWN_RAMP after it.
+NIGHT_PROBE_MAX_INTERVAL = timedelta(hours=2)
+DAWN_PREWARM = timedelta(minutes=15)
+DAWN_RAMP = timedelta(minutes=30)
+DAWN_PROBE_INTERVAL = timedelta(minutes=1)
+# With CONF_STAGGER_REQUESTS, station requests of a fast cycle are spread over this window.
+STAGGER_WINDOW = timedelta(seconds=15)
+# A station whose refresh fails keeps its last data and is retried on the next cycle, then
+# after STATION_RETRY_BASE_INTERVAL doubling per failure up to STATION_RETRY_MAX_INTERVAL.
+STATION_RETRY_BASE_INTERVAL = timedelta(seconds=30)
+STATION_RETRY_MAX_INTERVAL = timedelta(minutes=5)
+# Fast polling reuses the station list from the device cycle up to this age.
+STATION_LIST_MAX_AGE = timedelta(minutes=30)
+# A plant's device list is reused while its topology fingerprint is unchanged, up to this age.
+DEVICE_LIST_MAX_AGE = timedelta(hours=1)
+# Inverter details cache: static metadata is kept for a day; readings of online inverters
+# expire before the next device cycle, readings of offline inverters are reused longer.
+INVERTER_STATIC_DETAILS_TTL = timedelta(hours=24)
+INVERTER_ONLINE_READINGS_TTL = timedelta(minutes=4)
+INVERTER_OFFLINE_READINGS_TTL = timedelta(minutes=30)
 
 POWER_LIMIT_PARAM_CODE = "72"
 POWER_LIMIT_MIN_PERCENT = 2
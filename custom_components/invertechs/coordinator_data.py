@@ -2,111 +2,624 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
+from collections.abc import Awaitable, Callable, Collection, Iterable, Mapping
+from dataclasses import dataclass, field, replace
 import logging
-from typing import Any
+import time
+from typing import Any, TypeVar
 
-from .client import InvertechsClient, InvertechsError
-from .entity import DEVICE_TYPE_INVERTER
+from homeassistant.util import dt as dt_util
+
+from .client import (
+    DEVICES_PATH,
+    INVERTER_DETAILS_PATH,
+    InvertechsAuthError,
+    InvertechsCircuitOpenError,
+    InvertechsClient,
+    InvertechsError,
+)
+from .const import (
+    DEVICE_LIST_MAX_AGE,
+    INVERTER_OFFLINE_READINGS_TTL,
+    INVERTER_ONLINE_READINGS_TTL,
+    INVERTER_STATIC_DETAILS_TTL,
+    MAX_CONCURRENT_DETAIL_REQUESTS,
+    MAX_CONCURRENT_STATION_REQUESTS,
+    STATION_LIST_MAX_AGE,
+    STATION_RETRY_BASE_INTERVAL,
+    STATION_RETRY_MAX_INTERVAL,
+)
+from .models import Inverter, LiveData, Plant, inverters_from_devices
+from .polling import StationPollMode
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# getWnDataDetails fields that describe the inverter rather than its current output.
+INVERTER_STATIC_DETAIL_KEYS = frozenset(
+    {
+        "wnId",
+        "model",
+        "softwareVersion",
+        "hardwareVersion",
+        "ratedPower",
+        "wnType",
+        "stationName",
+    }
+)
+
+
+@dataclass
+class _CachedInverterDetails:
+    static: dict[str, Any]
+    static_at: float
+    readings: dict[str, Any]
+    readings_at: float
+
+
+@dataclass
+class InverterDetailsCache:
+    """Inverter details by wnId, with separate lifetimes for metadata and readings."""
+
+    entries: dict[str, _CachedInverterDetails] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, wn_id: str, readings_ttl: float) -> dict[str, Any] | None:
+        """Return cached details when the readings are younger than readings_ttl."""
+        entry = self.entries.get(wn_id)
+        if entry is None or time.monotonic() - entry.readings_at > readings_ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {**entry.readings, **entry.static}
+
+    def last(self, wn_id: str) -> dict[str, Any] | None:
+        """Return the last stored details whatever their age."""
+        entry = self.entries.get(wn_id)
+        return {**entry.readings, **entry.static} if entry is not None else None
+
+    def store(self, wn_id: str, details: dict[str, Any]) -> dict[str, Any]:
+        """Store fresh details and return them with the cached metadata applied."""
+        now = time.monotonic()
+        readings = {
+            key: value
+            for key, value in details.items()
+            if key not in INVERTER_STATIC_DETAIL_KEYS
+        }
+        entry = self.entries.get(wn_id)
+        if entry is None or now - entry.static_at > INVERTER_STATIC_DETAILS_TTL.total_seconds():
+            static = {
+                key: value
+                for key, value in details.items()
+                if key in INVERTER_STATIC_DETAIL_KEYS
+            }
+            entry = self.entries[wn_id] = _CachedInverterDetails(static, now, readings, now)
+        else:
+            entry.readings = readings
+            entry.readings_at = now
+        return {**entry.readings, **entry.static}
+
+
+@dataclass
+class _StationFailure:
+    attempts: int
+    retry_at: float
+    error: str
+
+
+@dataclass
+class StationFailures:
+    """Stations whose last refresh failed in one coordinator, with their retry schedule.
+
+    A failing station keeps its last good plant, marked stale, while the other stations
+    keep updating. It is retried on the next cycle, then after STATION_RETRY_BASE_INTERVAL
+    doubling per failure, up to STATION_RETRY_MAX_INTERVAL.
+    """
+
+    name: str
+    stations: dict[str, _StationFailure] = field(default_factory=dict)
+
+    def due(self, station_id: str) -> bool:
+        """Return True when a station may be refreshed in this cycle."""
+        failure = self.stations.get(station_id)
+        return failure is None or time.monotonic() >= failure.retry_at
+
+    def record_failure(self, station_id: str, err: Exception) -> None:
+        failure = self.stations.get(station_id)
+        attempts = failure.attempts + 1 if failure else 1
+        delay = (
+            0.0
+            if attempts == 1
+            else min(
+                STATION_RETRY_BASE_INTERVAL.total_seconds() * 2 ** min(attempts - 2, 16),
+                STATION_RETRY_MAX_INTERVAL.total_seconds(),
+            )
+        )
+        self.stations[station_id] = _StationFailure(
+            attempts, time.monotonic() + delay, str(err)
+        )
+        if attempts == 1:
+            _LOGGER.warning(
+                "Refreshing station %s (%s) failed; other stations keep updating: %s",
+                station_id,
+                self.name,
+                err,
+            )
+        else:
+            _LOGGER.debug(
+                "Station %s (%s) failed %s times; retrying in %.0f s: %s",
+                station_id,
+                self.name,
+                attempts,
+                delay,
+                err,
+            )
+
+    def record_success(self, station_id: str) -> None:
+        if self.stations.pop(station_id, None) is not None:
+            _LOGGER.info("Station %s (%s) refreshed again", station_id, self.name)
+
+    def retain(self, station_ids: Iterable[str]) -> None:
+        """Forget stations that are no longer listed."""
+        for station_id in self.stations.keys() - set(station_ids):
+            del self.stations[station_id]
+
+    def skip_failing(
+        self, modes: Mapping[str, StationPollMode]
+    ) -> dict[str, StationPollMode]:
+        """Return modes with failing stations skipped, as their plants are not new readings."""
+        return {**modes, **dict.fromkeys(self.stations, StationPollMode.SKIP)}
+
+
+async def _refresh_isolated(
+    failures: StationFailures | None,
+    station_id: str,
+    cached_plant: Plant | None,
+    refresh: Callable[[], Awaitable[Plant]],
+) -> Plant | None:
+    """Refresh one station; with failures, a failing station keeps its cached plant.
+
+    Returns None for a failing station without cached data. Authentication errors and an
+    open circuit concern the whole account and are raised.
+    """
+    if failures is None:
+        return await refresh()
+    if not failures.due(station_id):
+        return cached_plant
+    try:
+        power_plant = await refresh()
+    except (InvertechsAuthError, InvertechsCircuitOpenError):
+        raise
+    except InvertechsError as err:
+        failures.record_failure(station_id, err)
+        if cached_plant is None or cached_plant.stale_since is not None:
+            return cached_plant
+        return replace(cached_plant, stale_since=dt_util.utcnow())
+    failures.record_success(station_id)
+    return power_plant
+
+
+def _refreshed_plants(results: list[Plant | None]) -> list[Plant]:
+    """Drop failing stations without cached data; fail when no station is left."""
+    power_plants = [power_plant for power_plant in results if power_plant is not None]
+    if results and not power_plants:
+        raise InvertechsError(f"None of {len(results)} stations could be refreshed")
+    return power_plants
+
+
+async def _gather_bounded(
+    items: Iterable[_T],
+    worker: Callable[[_T], Awaitable[_R]],
+    *,
+    semaphore: asyncio.Semaphore,
+    start_delay: Callable[[_T], float] | None = None,
+) -> list[_R]:
+    """Run worker for every item, holding semaphore per call; results keep item order.
+
+    start_delay returns seconds to wait before an item's call; the wait does not hold
+    the semaphore.
+    """
+
+    async def _run(item: _T) -> _R:
+        if start_delay is not None and (delay := start_delay(item)) > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            return await worker(item)
+
+    tasks = [asyncio.ensure_future(_run(item)) for item in items]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+@dataclass
+class StationTopology:
+    """Station list shared between cycles so fast polling can skip UI2Page."""
+
+    stations: list[dict[str, Any]] = field(default_factory=list)
+    fetched_at: float | None = None
+    changed: bool = False
+    live_inverter_counts: dict[str, int] = field(default_factory=dict)
+    device_list_fingerprints: dict[str, tuple[tuple[Any, ...], float]] = field(
+        default_factory=dict
+    )
+    skipped_device_lists: int = 0
+
+    def reusable_stations(self) -> list[dict[str, Any]] | None:
+        """Return the stored list, or None when it must be fetched again."""
+        if (
+            self.fetched_at is None
+            or self.changed
+            or time.monotonic() - self.fetched_at > STATION_LIST_MAX_AGE.total_seconds()
+        ):
+            return None
+        return self.stations
+
+    def store(self, stations: list[dict[str, Any]]) -> None:
+        """Remember a freshly fetched station list."""
+        self.stations = stations
+        self.fetched_at = time.monotonic()
+        self.changed = False
+        self.live_inverter_counts = {}
+
+    def device_list_is_current(self, station_id: str, fingerprint: tuple[Any, ...]) -> bool:
+        """Return True when the stored device list for a station can be reused."""
+        known = self.device_list_fingerprints.get(station_id)
+        if known is None:
+            return False
+        known_fingerprint, fetched_at = known
+        return (
+            known_fingerprint == fingerprint
+            and time.monotonic() - fetched_at <= DEVICE_LIST_MAX_AGE.total_seconds()
+        )
+
+    def device_list_changed(self, station_id: str, fingerprint: tuple[Any, ...]) -> bool:
+        """Return True when a stored device list has a different fingerprint."""
+        known = self.device_list_fingerprints.get(station_id)
+        return known is not None and known[0] != fingerprint
+
+    def record_device_list(self, station_id: str, fingerprint: tuple[Any, ...]) -> None:
+        self.device_list_fingerprints[station_id] = (fingerprint, time.monotonic())
+
+    def check_live(self, power_plants: list[Plant]) -> None:
+        """Flag the list for refetch when live data suggests stations or inverters changed."""
+        for power_plant in power_plants:
+            station_id = power_plant.id
+            if power_plant.details is None:
+                _LOGGER.debug(
+                    "No live details for station %s; refreshing station list", station_id
+                )
+                self.changed = True
+                continue
+            count = len(power_plant.live.inverters) if power_plant.live else 0
+            wn_num = power_plant.wn_num
+            if isinstance(wn_num, int) and count > wn_num:
+                _LOGGER.debug(
+                    "Station %s reports %s live inverters but wnNum %s; "
+                    "refreshing station list",
+                    station_id,
+                    count,
+                    wn_num,
+                )
+                self.changed = True
+                continue
+            baseline = self.live_inverter_counts.setdefault(station_id, count)
+            if count != baseline:
+                _LOGGER.debug(
+                    "Live inverter count for station %s changed (%s -> %s); "
+                    "refreshing station list",
+                    station_id,
+                    baseline,
+                    count,
+                )
+                self.changed = True
+
+
+def _poll_mode(
+    poll_modes: Mapping[str, StationPollMode] | None,
+    cached_by_id: Mapping[str, Plant],
+    station_id: str,
+) -> StationPollMode:
+    """Return a station's poll mode; stations without cached data are fetched in full."""
+    if not poll_modes or station_id not in cached_by_id:
+        return StationPollMode.FULL
+    return poll_modes.get(station_id, StationPollMode.FULL)
+
 
 async def fetch_fast_power_plants(
     client: InvertechsClient,
-    cached_plants: list[dict[str, Any]] | None,
+    cached_plants: list[Plant] | None,
     *,
-    reduced_polling: bool,
-) -> list[dict[str, Any]]:
-    """Fetch plant metrics; use reduced polling when inverters are offline."""
-    cached_by_id = {plant["id"]: plant for plant in cached_plants or []}
+    poll_modes: Mapping[str, StationPollMode] | None = None,
+    start_delays: Mapping[str, float] | None = None,
+    stations: list[dict[str, Any]] | None = None,
+    topology: StationTopology | None = None,
+    failures: StationFailures | None = None,
+    max_concurrency: int = MAX_CONCURRENT_STATION_REQUESTS,
+) -> list[Plant]:
+    """Fetch plant metrics, polling each station in its mode from poll_modes.
 
-    if reduced_polling and cached_plants:
-        power_plants = copy.deepcopy(cached_plants)
+    Skipped stations keep their cached plant; reduced ones (offline) only get the
+    station refresh and an IoT probe. Stations in start_delays wait that many seconds
+    before their requests. A station list fetched by the caller may be passed in to
+    skip the UI2Page request; otherwise the list stored in topology is reused while it
+    is fresh. No list is needed when no station is due a full poll. With failures, a
+    station that fails keeps its cached plant, marked stale, until a retry succeeds.
+    """
+    cached_by_id = {plant.id: plant for plant in cached_plants or []}
+    if cached_plants and all(
+        _poll_mode(poll_modes, cached_by_id, plant.id) is not StationPollMode.FULL
+        for plant in cached_plants
+    ):
+        items: list[tuple[str, dict[str, Any] | None]] = [
+            (plant.id, None) for plant in cached_plants
+        ]
     else:
-        power_plants = await client.get_stations()
+        if stations is None and topology:
+            stations = topology.reusable_stations()
+        if stations is None:
+            stations = await client.get_stations()
+            if topology:
+                topology.store(stations)
+        items = [(station["id"], station) for station in stations]
+    fully_polled: list[Plant] = []
 
-    for power_plant in power_plants:
-        station_id = power_plant["id"]
-        cached_plant = cached_by_id.get(station_id)
+    async def _refresh(item: tuple[str, dict[str, Any] | None]) -> Plant | None:
+        station_id, station = item
+        mode = _poll_mode(poll_modes, cached_by_id, station_id)
+        if mode is StationPollMode.SKIP:
+            return cached_by_id[station_id]
+        return await _refresh_isolated(
+            failures,
+            station_id,
+            cached_by_id.get(station_id),
+            lambda: _poll(station_id, station, mode),
+        )
 
-        if reduced_polling:
+    async def _poll(
+        station_id: str, station: dict[str, Any] | None, mode: StationPollMode
+    ) -> Plant:
+        if mode is StationPollMode.REDUCED:
+            cached_plant = cached_by_id[station_id]
             # Plant connection and current power from refresh; inverter connection from IoT probe.
-            power_plant["details"] = await client.refresh_station_details(station_id)
-            power_plant["live"] = await _fetch_live_or_cache(
-                client, station_id, cached_plant
+            details, live = await asyncio.gather(
+                client.refresh_station_details(station_id),
+                _fetch_live_or_cache(client, cached_plant),
             )
-        else:
-            power_plant["details"] = await client.refresh_station_details(station_id)
-            power_plant["live"] = await client.get_station_wn_power_info(station_id)
+            return cached_plant.with_readings(details, live)
+        details, live = await asyncio.gather(
+            client.refresh_station_details(station_id),
+            client.get_station_wn_power_info(station_id),
+        )
+        power_plant = replace(Plant.from_api(station, details), live=LiveData.from_api(live))
+        fully_polled.append(power_plant)
+        return power_plant
 
-    return power_plants
+    results = await _gather_bounded(
+        items,
+        _refresh,
+        semaphore=asyncio.Semaphore(max(1, max_concurrency)),
+        start_delay=(lambda item: start_delays.get(item[0], 0.0)) if start_delays else None,
+    )
+    if failures:
+        failures.retain(station_id for station_id, _ in items)
+    if topology:
+        topology.check_live(fully_polled)
+    return _refreshed_plants(results)
 
 
-async def _fetch_live_or_cache(
-    client: InvertechsClient,
-    station_id: str,
-    cached_plant: dict[str, Any] | None,
-) -> dict[str, Any]:
+async def _fetch_live_or_cache(client: InvertechsClient, cached_plant: Plant) -> LiveData:
     """Probe IoT for inverter connection; reuse cache when the inverter is unreachable."""
     try:
-        return await client.get_station_wn_power_info(station_id)
+        return LiveData.from_api(await client.get_station_wn_power_info(cached_plant.id))
     except InvertechsError as err:
         _LOGGER.debug(
             "IoT probe failed for station %s (%s), using cached live data",
-            station_id,
+            cached_plant.id,
             err,
         )
-        if cached_plant:
-            live = cached_plant.get("live")
-            if isinstance(live, dict):
-                return live
-        return {}
+        return cached_plant.live if cached_plant.live is not None else LiveData()
 
 
 async def fetch_full_power_plants(
     client: InvertechsClient,
-    cached_plants: list[dict[str, Any]] | None,
+    cached_plants: list[Plant] | None,
     *,
-    reduced_polling: bool,
-) -> list[dict[str, Any]]:
-    """Fetch power plants with devices and inverter details."""
-    if reduced_polling:
-        if cached_plants:
-            return copy.deepcopy(cached_plants)
-        _LOGGER.debug("Skipping device detail fetch while inverters are offline (no cache)")
-
-    power_plants = await client.get_stations()
-    for power_plant in power_plants:
-        await _refresh_power_plant(client, power_plant, cached_plant=None)
+    poll_modes: Mapping[str, StationPollMode] | None = None,
+    stations: list[dict[str, Any]] | None = None,
+    topology: StationTopology | None = None,
+    live_plants: list[Plant] | None = None,
+    details_cache: InverterDetailsCache | None = None,
+    snapshot_stations: Collection[str] = (),
+    failures: StationFailures | None = None,
+    max_concurrency: int = MAX_CONCURRENT_STATION_REQUESTS,
+    max_detail_concurrency: int = MAX_CONCURRENT_DETAIL_REQUESTS,
+) -> list[Plant]:
+    """Fetch power plants with devices and inverter details.
+
+    The station list used here is stored in topology for the fast cycle to reuse. A
+    plant's device list is only downloaded again when its topology fingerprint (built
+    from wnNum and the live inverter IDs in live_plants) changes or ages out. Inverter
+    details come from details_cache while their readings are fresh enough: online
+    inverters are fetched every cycle, offline ones far less often. Stations in
+    snapshot_stations are due their final offline snapshot, so their details are always
+    fetched fresh. Stations skipped in poll_modes keep their cached plant, and so do
+    stations that fail when failures is given.
+    """
+    cached_by_id = {plant.id: plant for plant in cached_plants or []}
+    if cached_plants and all(
+        _poll_mode(poll_modes, cached_by_id, plant.id) is StationPollMode.SKIP
+        for plant in cached_plants
+    ):
+        # Plants are immutable, so the cached list is served as is.
+        return cached_plants
+
+    if stations is None:
+        stations = await client.get_stations()
+    if topology:
+        topology.store(stations)
+    live_by_id = {plant.id: plant for plant in live_plants or []}
+    # Shared across plants so large sites cannot multiply the detail requests in flight.
+    details_semaphore = asyncio.Semaphore(max(1, max_detail_concurrency))
+    skipped = 0
+
+    async def _refresh(station: dict[str, Any]) -> Plant | None:
+        station_id = station["id"]
+        cached_plant = cached_by_id.get(station_id)
+        if _poll_mode(poll_modes, cached_by_id, station_id) is StationPollMode.SKIP:
+            return cached_plant
+        return await _refresh_isolated(
+            failures, station_id, cached_plant, lambda: _poll(station, cached_plant)
+        )
+
+    async def _poll(station: dict[str, Any], cached_plant: Plant | None) -> Plant:
+        nonlocal skipped
+        station_id = station["id"]
+        fingerprint = station_fingerprint(station, live_by_id.get(station_id))
+        reuse_devices = bool(
+            topology
+            and cached_plant
+            and cached_plant.inverters is not None
+            and topology.device_list_is_current(station_id, fingerprint)
+        )
+        if reuse_devices:
+            skipped += 1
+        elif topology and topology.device_list_changed(station_id, fingerprint):
+            # The client may still hold the old list; the new inverters must be fetched.
+            client.invalidate_cache(DEVICES_PATH, powerStationId=station_id)
+        power_plant = await _refresh_power_plant(
+            client,
+            station,
+            live_by_id.get(station_id),
+            previous_plant=cached_plant,
+            cached_plant=cached_plant if reuse_devices else None,
+            details_cache=details_cache,
+            details_semaphore=details_semaphore,
+            refresh_details=station_id in snapshot_stations,
+        )
+        if topology and not reuse_devices:
+            topology.record_device_list(station_id, fingerprint)
+        return power_plant
+
+    results = await _gather_bounded(
+        stations, _refresh, semaphore=asyncio.Semaphore(max(1, max_concurrency))
+    )
+    if failures:
+        failures.retain(station["id"] for station in stations)
+    power_plants = _refreshed_plants(results)
+    if topology:
+        topology.skipped_device_lists = skipped
+    _LOGGER.debug(
+        "Device cycle reused device lists for %s of %s plants", skipped, len(power_plants)
+    )
     return power_plants
 
 
+def station_fingerprint(
+    station: dict[str, Any],
+    live_plant: Plant | None,
+) -> tuple[Any, ...]:
+    """Return what identifies a plant's inverter topology: wnNum and live inverter IDs."""
+    live = live_plant.live if live_plant else None
+    wn_ids = sorted(wn.wn_id for wn in live.inverters) if live else []
+    return (station.get("wnNum"), tuple(wn_ids))
+
+
 async def _refresh_power_plant(
     client: InvertechsClient,
-    power_plant: dict[str, Any],
-    cached_plant: dict[str, Any] | None,
-) -> None:
-    """Load devices and inverter details for one power plant."""
-    power_plant_id = power_plant["id"]
-    if "details" not in power_plant:
-        power_plant["details"] = await client.get_station_details(power_plant_id)
-
-    cached_details_by_wn: dict[str, dict[str, Any]] = {}
-    if cached_plant:
-        for device in cached_plant.get("devices", []):
-            if device.get("devicesType") == DEVICE_TYPE_INVERTER and device.get("wnStationVo"):
-                wn = device["wnStationVo"]
-                if wn.get("details"):
-                    cached_details_by_wn[wn["wnId"]] = wn["details"]
-
-    power_plant["devices"] = await client.get_devices_in_station(power_plant_id)
-    for device in power_plant["devices"]:
-        if device.get("devicesType") != DEVICE_TYPE_INVERTER or not device.get("wnStationVo"):
-            continue
-        wn = device["wnStationVo"]
-        wn_id = wn["wnId"]
-        if wn_id in cached_details_by_wn:
-            wn["details"] = cached_details_by_wn[wn_id]
+    station: dict[str, Any],
+    live_plant: Plant | None,
+    *,
+    previous_plant: Plant | None = None,
+    cached_plant: Plant | None,
+    details_cache: InverterDetailsCache | None,
+    details_semaphore: asyncio.Semaphore,
+    refresh_details: bool = False,
+) -> Plant:
+    """Build one power plant with devices and inverter details.
+
+    Station details and the device list are taken from cached_plant when given. With
+    refresh_details, every inverter's details are requested from the API, bypassing
+    both the details cache and the client's response cache. An inverter whose details
+    request fails keeps its last good details, from details_cache or previous_plant.
+    """
+    power_plant_id = station["id"]
+    if cached_plant is not None:
+        power_plant = replace(Plant.from_api(station), details=cached_plant.details)
+        inverters = cached_plant.inverters or ()
+    else:
+        details, devices = await asyncio.gather(
+            client.get_station_details(power_plant_id),
+            client.get_devices_in_station(power_plant_id),
+        )
+        power_plant = Plant.from_api(station, details)
+        inverters = inverters_from_devices(devices)
+
+    if refresh_details:
+        client.invalidate_cache(INVERTER_DETAILS_PATH, stationId=power_plant_id)
+    loaded = list(inverters)
+    pending: list[int] = []
+    for position, inverter in enumerate(inverters):
+        cached = (
+            details_cache.get(inverter.wn_id, _readings_ttl(live_plant, inverter.wn_id))
+            if details_cache and not refresh_details
+            else None
+        )
+        if cached is not None:
+            loaded[position] = inverter.with_details(cached)
         else:
-            wn["details"] = await client.get_inverter_details(wn_id, power_plant_id)
+            pending.append(position)
+
+    async def _load_details(position: int) -> None:
+        inverter = inverters[position]
+        wn_id = inverter.wn_id
+        try:
+            details = await client.get_inverter_details(wn_id, power_plant_id)
+        except (InvertechsAuthError, InvertechsCircuitOpenError):
+            # The whole account is affected; let the coordinator serve its cached plants.
+            raise
+        except InvertechsError as err:
+            # Keep the rest of the plant; the inverter is retried on the next device cycle.
+            _LOGGER.debug(
+                "Inverter details failed for %s in station %s, keeping its last details: %s",
+                wn_id,
+                power_plant_id,
+                err,
+            )
+            loaded[position] = _with_last_details(inverter, details_cache, previous_plant)
+            return
+        if details_cache and isinstance(details, dict):
+            details = details_cache.store(wn_id, details)
+        loaded[position] = inverter.with_details(details)
+
+    await _gather_bounded(pending, _load_details, semaphore=details_semaphore)
+    return replace(power_plant, inverters=tuple(loaded))
+
+
+def _with_last_details(
+    inverter: Inverter,
+    details_cache: InverterDetailsCache | None,
+    previous_plant: Plant | None,
+) -> Inverter:
+    """Return the inverter with the last details it was seen with, if any."""
+    if details_cache and (details := details_cache.last(inverter.wn_id)) is not None:
+        return inverter.with_details(details)
+    for previous in (previous_plant.inverters or ()) if previous_plant else ():
+        if previous.wn_id == inverter.wn_id:
+            return replace(inverter, details=previous.details)
+    return inverter
+
+
+def _readings_ttl(live_plant: Plant | None, wn_id: str) -> float:
+    """Return how long cached readings stay valid, based on the live online status."""
+    live_wn = live_plant.live.inverter(wn_id) if live_plant and live_plant.live else None
+    if live_wn is not None and not live_wn.is_online:
+        return INVERTER_OFFLINE_READINGS_TTL.total_seconds()
+    return INVERTER_ONLINE_READINGS_TTL.total_seconds()
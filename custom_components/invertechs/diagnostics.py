@@ -0,0 +1,78 @@
+"""Diagnostics support for the Invertechs integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .entity import get_state_write_stats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return request, cache, rate limit, queue and circuit breaker state for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    client = entry_data["client"]
+    return {
+        "region": client.region,
+        "circuit_open": client.circuit_breaker.is_open,
+        "circuit_stats": asdict(client.circuit_breaker.stats),
+        "stale_plants": {
+            name: {
+                plant.id: plant.stale_since.isoformat()
+                for plant in entry_data[coordinator_key].data or []
+                if plant.stale_since is not None
+            }
+            for name, coordinator_key in (
+                ("fast", "fast_coordinator"),
+                ("devices", "coordinator"),
+            )
+        },
+        "rate_limit": {
+            "rate": client.rate_limiter.rate,
+            "burst": client.rate_limiter.burst,
+            **asdict(client.rate_limiter.stats),
+        },
+        "request_queue": {
+            "queued": client.request_queue.queued,
+            **{
+                priority.name.lower(): {
+                    "limit": client.request_queue.class_limits[priority],
+                    "in_flight": client.request_queue.in_flight[priority],
+                    **asdict(stats),
+                }
+                for priority, stats in client.request_queue.stats.items()
+            },
+        },
+        "stations_online": entry_data["scheduler"].online_stations,
+        "stations_tracked": len(entry_data["scheduler"].stations),
+        "stagger_requests": entry_data["scheduler"].stagger_window is not None,
+        "failing_stations": {
+            failures.name: {
+                station_id: {"attempts": failure.attempts, "error": failure.error}
+                for station_id, failure in failures.stations.items()
+            }
+            for failures in (
+                entry_data["fast_station_failures"],
+                entry_data["device_station_failures"],
+            )
+        },
+        "device_lists_reused_last_cycle": entry_data["station_topology"].skipped_device_lists,
+        "entity_discovery_passes": entry_data["discovery"].passes,
+        "state_writes": {
+            "fast": asdict(get_state_write_stats(entry_data["fast_coordinator"])),
+            "devices": asdict(get_state_write_stats(entry_data["coordinator"])),
+        },
+        "inverter_details_cache": {
+            "hits": entry_data["details_cache"].hits,
+            "misses": entry_data["details_cache"].misses,
+            "inverters": len(entry_data["details_cache"].entries),
+        },
+        "client_stats": asdict(client.stats),
+        "cache_stats": {**asdict(client.cache.stats), "entries": len(client.cache)},
+    }
@@ -2,29 +2,34 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
+import logging
 from typing import Any
 
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntityDescription,
-)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfElectricCurrent, UnitOfElectricPotential, UnitOfPower
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .entity import (
-    DEVICE_TYPE_INVERTER,
     INVERTER_BINARY_SENSOR_DESCRIPTIONS,
-    INVERTER_INPUT_SENSOR_KEYS,
+    INVERTER_INPUT_SENSOR_DESCRIPTIONS,
     INVERTER_SENSOR_DESCRIPTIONS,
     POWER_PLANT_BINARY_SENSOR_DESCRIPTIONS,
     POWER_PLANT_SENSOR_DESCRIPTIONS,
-    get_live_data,
     inverter_device_info,
     inverter_device_info_from_live,
-    inverter_input_sensor_description,
+    power_plant_device_info,
 )
+from .models import Inverter, LiveInverter, Plant
+
+_LOGGER = logging.getLogger(__name__)
+
+DiscoverEntities = Callable[
+    [DataUpdateCoordinator[list[Plant]], ConfigEntry, "EntityDiscoveryState"], list[Any]
+]
 
 
 @dataclass
@@ -32,6 +37,7 @@ class EntityDiscoveryState:
     """Track entities already registered with Home Assistant."""
 
     registered_unique_ids: set[str] = field(default_factory=set)
+    device_infos: dict[tuple[Any, ...], DeviceInfo] = field(default_factory=dict)
 
 
 def _register(
@@ -47,8 +53,162 @@ def _register(
     return True
 
 
+def _power_plant_device_info(state: EntityDiscoveryState, power_plant: Plant) -> DeviceInfo:
+    key = ("plant", power_plant.id)
+    if key not in state.device_infos:
+        state.device_infos[key] = power_plant_device_info(power_plant)
+    return state.device_infos[key]
+
+
+def _inverter_device_info(
+    state: EntityDiscoveryState, inverter: Inverter, power_plant_id: str
+) -> DeviceInfo:
+    has_details = inverter.details is not None
+    key = ("inverter", inverter.wn_id, has_details)
+    if key not in state.device_infos:
+        if has_details:
+            # Built before the details arrived, with the model still unknown.
+            state.device_infos.pop(("inverter", inverter.wn_id, False), None)
+        state.device_infos[key] = inverter_device_info(inverter, power_plant_id)
+    return state.device_infos[key]
+
+
+def _live_inverter_device_info(
+    state: EntityDiscoveryState, wn: LiveInverter, power_plant_id: str
+) -> DeviceInfo:
+    key = ("live_inverter", wn.wn_id)
+    if key not in state.device_infos:
+        state.device_infos[key] = inverter_device_info_from_live(wn, power_plant_id)
+    return state.device_infos[key]
+
+
+def fast_topology_hash(power_plants: list[Plant] | None) -> int:
+    """Return a hash of the plants and live inverters that fast-cycle entities exist for."""
+    return hash(
+        tuple(
+            (
+                power_plant.id,
+                tuple(wn.wn_id for wn in power_plant.live.inverters)
+                if power_plant.live
+                else (),
+            )
+            for power_plant in power_plants or []
+        )
+    )
+
+
+def device_topology_hash(power_plants: list[Plant] | None) -> int:
+    """Return a hash of the inverters (and input counts) device-cycle entities exist for."""
+    return hash(
+        tuple(
+            (
+                power_plant.id,
+                tuple(
+                    (
+                        inverter.wn_id,
+                        inverter.details.wn_type if inverter.details else None,
+                    )
+                    for inverter in power_plant.inverters or ()
+                ),
+            )
+            for power_plant in power_plants or []
+        )
+    )
+
+
+@dataclass
+class _PlatformDiscovery:
+    async_add_entities: AddEntitiesCallback
+    fast: tuple[DiscoverEntities, ...]
+    devices: tuple[DiscoverEntities, ...]
+
+
+class EntityDiscovery:
+    """Entity discovery shared by all platforms of a config entry.
+
+    A platform is discovered once when it is added. After that, all platforms are
+    discovered together, and only when a coordinator refresh changes its topology hash.
+    """
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        fast_coordinator: DataUpdateCoordinator[list[Plant]],
+        device_coordinator: DataUpdateCoordinator[list[Plant]],
+    ) -> None:
+        self._entry = entry
+        self._fast_coordinator = fast_coordinator
+        self._device_coordinator = device_coordinator
+        self._state = EntityDiscoveryState()
+        self._platforms: list[_PlatformDiscovery] = []
+        self._fast_topology = fast_topology_hash(fast_coordinator.data)
+        self._device_topology = device_topology_hash(device_coordinator.data)
+        self.passes = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Listen for coordinator refreshes until the entry is unloaded."""
+        self._entry.async_on_unload(
+            self._fast_coordinator.async_add_listener(self._handle_fast_update)
+        )
+        self._entry.async_on_unload(
+            self._device_coordinator.async_add_listener(self._handle_device_update)
+        )
+
+    @callback
+    def async_add_platform(
+        self,
+        async_add_entities: AddEntitiesCallback,
+        *,
+        fast: tuple[DiscoverEntities, ...] = (),
+        devices: tuple[DiscoverEntities, ...] = (),
+    ) -> None:
+        """Register a platform's discover functions and add its current entities."""
+        platform = _PlatformDiscovery(async_add_entities, fast, devices)
+        self._platforms.append(platform)
+        self._discover(platform, self._fast_coordinator, platform.fast)
+        self._discover(platform, self._device_coordinator, platform.devices)
+
+    @callback
+    def _handle_fast_update(self) -> None:
+        topology = fast_topology_hash(self._fast_coordinator.data)
+        if topology == self._fast_topology:
+            return
+        self._fast_topology = topology
+        _LOGGER.debug("Live topology changed; discovering new entities")
+        for platform in self._platforms:
+            self._discover(platform, self._fast_coordinator, platform.fast)
+
+    @callback
+    def _handle_device_update(self) -> None:
+        topology = device_topology_hash(self._device_coordinator.data)
+        if topology == self._device_topology:
+            return
+        self._device_topology = topology
+        _LOGGER.debug("Device topology changed; discovering new entities")
+        for platform in self._platforms:
+            self._discover(platform, self._device_coordinator, platform.devices)
+
+    def _discover(
+        self,
+        platform: _PlatformDiscovery,
+        coordinator: DataUpdateCoordinator[list[Plant]],
+        discover_functions: tuple[DiscoverEntities, ...],
+    ) -> None:
+        if not discover_functions:
+            return
+        self.passes += 1
+        entities = [
+            entity
+            for discover in discover_functions
+            for entity in discover(coordinator, self._entry, self._state)
+        ]
+        if entities:
+            platform.async_add_entities(entities)
+
+
 def discover_power_plant_sensor_entities(
-    power_plant_coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    power_plant_coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -57,20 +217,24 @@ def discover_power_plant_sensor_entities(
 
     entities: list[Any] = []
     for power_plant in power_plant_coordinator.data or []:
-        power_plant_id = power_plant["id"]
+        power_plant_id = power_plant.id
         for description in POWER_PLANT_SENSOR_DESCRIPTIONS:
             if not _register(state, entry, f"{power_plant_id}_{description.key}"):
                 continue
             entities.append(
                 InvertechsPowerPlantSensor(
-                    power_plant_coordinator, entry, power_plant, description
+                    power_plant_coordinator,
+                    entry,
+                    power_plant_id,
+                    _power_plant_device_info(state, power_plant),
+                    description,
                 )
             )
     return entities
 
 
 def discover_inverter_sensor_entities(
-    coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -79,61 +243,36 @@ def discover_inverter_sensor_entities(
 
     entities: list[Any] = []
     for power_plant in coordinator.data or []:
-        power_plant_id = power_plant["id"]
-        for device in power_plant.get("devices", []):
-            if device.get("devicesType") != DEVICE_TYPE_INVERTER or not device.get("wnStationVo"):
-                continue
-
-            wn = device["wnStationVo"]
-            wn_details = wn.get("details", {})
-            wn_id = wn["wnId"]
-            model = wn_details.get("model", "Unknown")
-            device_info = inverter_device_info(wn_id, wn_details, model, power_plant_id)
-
-            for description in INVERTER_SENSOR_DESCRIPTIONS:
+        power_plant_id = power_plant.id
+        for inverter in power_plant.inverters or ():
+            wn_id = inverter.wn_id
+            wn_type = (inverter.details.wn_type if inverter.details else None) or 0
+            descriptions = (
+                *INVERTER_SENSOR_DESCRIPTIONS,
+                *(
+                    description
+                    for input_descriptions in INVERTER_INPUT_SENSOR_DESCRIPTIONS[:wn_type]
+                    for description in input_descriptions
+                ),
+            )
+            for description in descriptions:
                 if not _register(state, entry, f"{wn_id}_{description.key}"):
                     continue
                 entities.append(
                     InvertechsInverterSensor(
-                        coordinator, entry, power_plant_id, wn_id, device_info, description
+                        coordinator,
+                        entry,
+                        power_plant_id,
+                        wn_id,
+                        _inverter_device_info(state, inverter, power_plant_id),
+                        description,
                     )
                 )
-
-            for index, input_keys in enumerate(INVERTER_INPUT_SENSOR_KEYS):
-                if wn_details.get("wnType", 0) < index + 1:
-                    continue
-                for description in (
-                    inverter_input_sensor_description(
-                        input_keys.voltage,
-                        input_keys.voltage_translation_key,
-                        SensorDeviceClass.VOLTAGE,
-                        UnitOfElectricPotential.VOLT,
-                    ),
-                    inverter_input_sensor_description(
-                        input_keys.current,
-                        input_keys.current_translation_key,
-                        SensorDeviceClass.CURRENT,
-                        UnitOfElectricCurrent.AMPERE,
-                    ),
-                    inverter_input_sensor_description(
-                        input_keys.power,
-                        input_keys.power_translation_key,
-                        SensorDeviceClass.POWER,
-                        UnitOfPower.WATT,
-                    ),
-                ):
-                    if not _register(state, entry, f"{wn_id}_{description.key}"):
-                        continue
-                    entities.append(
-                        InvertechsInverterSensor(
-                            coordinator, entry, power_plant_id, wn_id, device_info, description
-                        )
-                    )
     return entities
 
 
 def discover_power_plant_binary_sensor_entities(
-    power_plant_coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    power_plant_coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -145,27 +284,35 @@ def discover_power_plant_binary_sensor_entities(
 
     entities: list[Any] = []
     for power_plant in power_plant_coordinator.data or []:
-        power_plant_id = power_plant["id"]
+        power_plant_id = power_plant.id
         for description in POWER_PLANT_BINARY_SENSOR_DESCRIPTIONS:
             if not _register(state, entry, f"{power_plant_id}_{description.key}"):
                 continue
             if description.key == "isHaveAlarm":
                 entities.append(
                     InvertechsPowerPlantStatusBinarySensor(
-                        power_plant_coordinator, entry, power_plant, description
+                        power_plant_coordinator,
+                        entry,
+                        power_plant_id,
+                        _power_plant_device_info(state, power_plant),
+                        description,
                     )
                 )
             else:
                 entities.append(
                     InvertechsPowerPlantBinarySensor(
-                        power_plant_coordinator, entry, power_plant, description
+                        power_plant_coordinator,
+                        entry,
+                        power_plant_id,
+                        _power_plant_device_info(state, power_plant),
+                        description,
                     )
                 )
     return entities
 
 
 def discover_inverter_live_binary_sensor_entities(
-    fast_coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    fast_coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -175,11 +322,9 @@ def discover_inverter_live_binary_sensor_entities(
     entities: list[Any] = []
     connection_description = INVERTER_BINARY_SENSOR_DESCRIPTIONS[0]
     for power_plant in fast_coordinator.data or []:
-        power_plant_id = power_plant["id"]
-        for wn in get_live_data(power_plant).get("wnVoList", []):
-            wn_id = wn.get("wnId")
-            if not wn_id:
-                continue
+        power_plant_id = power_plant.id
+        for wn in power_plant.live.inverters if power_plant.live else ():
+            wn_id = wn.wn_id
             if not _register(state, entry, f"{wn_id}_{connection_description.key}"):
                 continue
             entities.append(
@@ -188,7 +333,7 @@ def discover_inverter_live_binary_sensor_entities(
                     entry,
                     power_plant_id,
                     wn_id,
-                    inverter_device_info_from_live(wn, power_plant_id),
+                    _live_inverter_device_info(state, wn, power_plant_id),
                     connection_description,
                 )
             )
@@ -196,7 +341,7 @@ def discover_inverter_live_binary_sensor_entities(
 
 
 def discover_inverter_binary_sensor_entities(
-    coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -206,17 +351,9 @@ def discover_inverter_binary_sensor_entities(
     entities: list[Any] = []
     alarm_description = INVERTER_BINARY_SENSOR_DESCRIPTIONS[1]
     for power_plant in coordinator.data or []:
-        power_plant_id = power_plant["id"]
-        for device in power_plant.get("devices", []):
-            if device.get("devicesType") != DEVICE_TYPE_INVERTER or not device.get("wnStationVo"):
-                continue
-
-            wn = device["wnStationVo"]
-            wn_details = wn.get("details", {})
-            wn_id = wn["wnId"]
-            model = wn_details.get("model", "Unknown")
-            device_info = inverter_device_info(wn_id, wn_details, model, power_plant_id)
-
+        power_plant_id = power_plant.id
+        for inverter in power_plant.inverters or ():
+            wn_id = inverter.wn_id
             if not _register(state, entry, f"{wn_id}_{alarm_description.key}"):
                 continue
             entities.append(
@@ -225,7 +362,7 @@ def discover_inverter_binary_sensor_entities(
                     entry,
                     power_plant_id,
                     wn_id,
-                    device_info,
+                    _inverter_device_info(state, inverter, power_plant_id),
                     alarm_description,
                 )
             )
@@ -233,7 +370,7 @@ def discover_inverter_binary_sensor_entities(
 
 
 def discover_inverter_power_limit_entities(
-    fast_coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+    fast_coordinator: DataUpdateCoordinator[list[Plant]],
     entry: ConfigEntry,
     state: EntityDiscoveryState,
 ) -> list[Any]:
@@ -242,11 +379,9 @@ def discover_inverter_power_limit_entities(
 
     entities: list[Any] = []
     for power_plant in fast_coordinator.data or []:
-        power_plant_id = power_plant["id"]
-        for wn in get_live_data(power_plant).get("wnVoList", []):
-            wn_id = wn.get("wnId")
-            if not wn_id:
-                continue
+        power_plant_id = power_plant.id
+        for wn in power_plant.live.inverters if power_plant.live else ():
+            wn_id = wn.wn_id
             if not _register(state, entry, f"{wn_id}_power_limit_percent"):
                 continue
             entities.append(
@@ -255,7 +390,7 @@ def discover_inverter_power_limit_entities(
                     entry,
                     power_plant_id,
                     wn_id,
-                    inverter_device_info_from_live(wn, power_plant_id),
+                    _live_inverter_device_info(state, wn, power_plant_id),
                 )
             )
     return entities
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntityDescription
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntityDescription, SensorStateClass
@@ -17,10 +18,13 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
 
-from .client import InvertechsClient
-from .const import DOMAIN
+from .const import DOMAIN, POWER_LIMIT_PARAM_CODE
+
+if TYPE_CHECKING:
+    from .models import Inverter, LiveInverter, Param, Plant
 
 MANUFACTURER = "Invertechs (Xiamen) Technology Co., Ltd."
 DEVICE_TYPE_INVERTER = 0
@@ -164,6 +168,48 @@ INVERTER_SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+
+def inverter_input_sensor_description(
+    api_key: str,
+    translation_key: str,
+    device_class: SensorDeviceClass,
+    unit: str,
+) -> SensorEntityDescription:
+    """Build a sensor description for an inverter DC input reading."""
+    return SensorEntityDescription(
+        key=api_key,
+        translation_key=translation_key,
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
+
+# Voltage, current and power descriptions for each DC input, in input order.
+INVERTER_INPUT_SENSOR_DESCRIPTIONS: tuple[tuple[SensorEntityDescription, ...], ...] = tuple(
+    (
+        inverter_input_sensor_description(
+            input_keys.voltage,
+            input_keys.voltage_translation_key,
+            SensorDeviceClass.VOLTAGE,
+            UnitOfElectricPotential.VOLT,
+        ),
+        inverter_input_sensor_description(
+            input_keys.current,
+            input_keys.current_translation_key,
+            SensorDeviceClass.CURRENT,
+            UnitOfElectricCurrent.AMPERE,
+        ),
+        inverter_input_sensor_description(
+            input_keys.power,
+            input_keys.power_translation_key,
+            SensorDeviceClass.POWER,
+            UnitOfPower.WATT,
+        ),
+    )
+    for input_keys in INVERTER_INPUT_SENSOR_KEYS
+)
+
 POWER_PLANT_BINARY_SENSOR_DESCRIPTIONS: tuple[BinarySensorEntityDescription, ...] = (
     BinarySensorEntityDescription(
         key="stationOnlineStatus",
@@ -195,32 +241,28 @@ INVERTER_BINARY_SENSOR_DESCRIPTIONS: tuple[BinarySensorEntityDescription, ...] =
 )
 
 
-def power_plant_device_info(power_plant: dict[str, Any]) -> DeviceInfo:
+def power_plant_device_info(power_plant: Plant) -> DeviceInfo:
     """Build device registry info for a power plant."""
     return DeviceInfo(
-        identifiers={(DOMAIN, power_plant["id"])},
-        name=power_plant["stationName"],
+        identifiers={(DOMAIN, power_plant.id)},
+        name=power_plant.name,
         manufacturer=MANUFACTURER,
         model=POWER_PLANT_MODEL,
-        model_id=power_plant["id"],
+        model_id=power_plant.id,
     )
 
 
-def inverter_device_info(
-    wn_id: str,
-    wn_details: dict[str, Any],
-    model: str,
-    power_plant_id: str,
-) -> DeviceInfo:
+def inverter_device_info(inverter: Inverter, power_plant_id: str) -> DeviceInfo:
     """Build device registry info for an inverter."""
+    details = inverter.details
     return DeviceInfo(
-        identifiers={(DOMAIN, wn_id)},
-        name=f"Inver Energy {model}",
+        identifiers={(DOMAIN, inverter.wn_id)},
+        name=f"Inver Energy {inverter.model}",
         manufacturer=MANUFACTURER,
-        model=model,
-        model_id=wn_details.get("wnId"),
-        sw_version=wn_details.get("softwareVersion"),
-        hw_version=wn_details.get("hardwareVersion"),
+        model=inverter.model,
+        model_id=inverter.wn_id if details else None,
+        sw_version=details.software_version if details else None,
+        hw_version=details.hardware_version if details else None,
         via_device=(DOMAIN, power_plant_id),
     )
 
@@ -228,106 +270,165 @@ def inverter_device_info(
 INVERTER_ONLINE_STATUS = 1
 
 
-def inverters_are_online(power_plant: dict[str, Any]) -> bool:
+def inverters_are_online(power_plant: Plant) -> bool:
     """Return True when at least one inverter reports online in live IoT data."""
-    wn_list = get_live_data(power_plant).get("wnVoList") or []
-    if not wn_list:
+    if power_plant.live is None:
         return False
-    return any(wn.get("onlineStatus") == INVERTER_ONLINE_STATUS for wn in wn_list)
-
-
-def account_inverters_are_online(power_plants: list[dict[str, Any]]) -> bool:
-    """Return True when any power plant has an online inverter."""
-    if not power_plants:
-        return True
-    return any(inverters_are_online(power_plant) for power_plant in power_plants)
-
-
-def get_live_data(power_plant: dict[str, Any]) -> dict[str, Any]:
-    """Return the live IoT payload for a power plant."""
-    live = power_plant.get("live")
-    return live if isinstance(live, dict) else {}
-
-
-def get_live_inverter(power_plant: dict[str, Any], wn_id: str) -> dict[str, Any] | None:
-    """Return one inverter entry from live IoT data."""
-    for wn in get_live_data(power_plant).get("wnVoList", []):
-        if wn.get("wnId") == wn_id:
-            return wn
-    return None
-
-
-def get_power_plant_value(power_plant: dict[str, Any], key: str) -> Any:
-    """Return a plant metric from refreshed station details."""
-    details = power_plant.get("details", {})
-    if key in details and details[key] is not None:
-        return details[key]
-    return power_plant.get(key)
-
-
-def get_inverter_power_limit_percent(power_plant: dict[str, Any], wn_id: str) -> float | None:
-    """Return inverter power limit percent from live IoT data."""
-    return InvertechsClient.get_inverter_power_limit_percent(get_live_data(power_plant), wn_id)
+    return any(wn.is_online for wn in power_plant.live.inverters)
 
 
 def inverter_device_info_from_live(
-    wn: dict[str, Any],
+    wn: LiveInverter,
     power_plant_id: str,
 ) -> DeviceInfo:
     """Build device registry info for an inverter using live IoT data."""
-    model = wn.get("modelVersion") or "Unknown"
+    model = wn.model_version or "Unknown"
     return DeviceInfo(
-        identifiers={(DOMAIN, wn["wnId"])},
+        identifiers={(DOMAIN, wn.wn_id)},
         name=f"Inver Energy {model}",
         manufacturer=MANUFACTURER,
         model=model,
-        model_id=wn.get("wnId"),
-        sw_version=wn.get("softwareVersion"),
-        hw_version=wn.get("hardwareVersion"),
+        model_id=wn.wn_id,
+        sw_version=wn.software_version,
+        hw_version=wn.hardware_version,
         via_device=(DOMAIN, power_plant_id),
     )
 
 
-def get_power_plant(
-    coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
-    power_plant_id: str,
-) -> dict[str, Any] | None:
-    """Return a power plant dict from coordinator data."""
+@dataclass
+class CoordinatorIndex:
+    """Lookup tables over one coordinator data snapshot."""
+
+    data: list[Plant]
+    power_plants: dict[str, Plant] = field(default_factory=dict)
+    inverters: dict[tuple[str, str], Inverter] = field(default_factory=dict)
+    live_inverters: dict[tuple[str, str], LiveInverter] = field(default_factory=dict)
+    live_params: dict[tuple[str, str | None, str], Param] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, data: list[Plant]) -> CoordinatorIndex:
+        """Index plants by ID and inverters and IoT params by plant ID and wnId."""
+        index = cls(data)
+        for power_plant in data:
+            power_plant_id = power_plant.id
+            index.power_plants.setdefault(power_plant_id, power_plant)
+            for inverter in power_plant.inverters or ():
+                index.inverters.setdefault((power_plant_id, inverter.wn_id), inverter)
+            if power_plant.live is None:
+                continue
+            for wn in power_plant.live.inverters:
+                index.live_inverters.setdefault((power_plant_id, wn.wn_id), wn)
+            for param in power_plant.live.params:
+                index.live_params.setdefault((power_plant_id, param.wn_id, param.code), param)
+        return index
+
+
+_COORDINATOR_INDEXES: WeakKeyDictionary[DataUpdateCoordinator, CoordinatorIndex] = (
+    WeakKeyDictionary()
+)
+
+
+def get_coordinator_index(
+    coordinator: DataUpdateCoordinator[list[Plant]],
+) -> CoordinatorIndex | None:
+    """Return the index for the coordinator's current data, built once per refresh."""
     if not coordinator.data:
         return None
-    for power_plant in coordinator.data:
-        if power_plant["id"] == power_plant_id:
-            return power_plant
-    return None
+    index = _COORDINATOR_INDEXES.get(coordinator)
+    if index is None or index.data is not coordinator.data:
+        index = _COORDINATOR_INDEXES[coordinator] = CoordinatorIndex.build(coordinator.data)
+    return index
 
 
-def get_inverter_wn(
-    coordinator: DataUpdateCoordinator[list[dict[str, Any]]],
+def get_power_plant(
+    coordinator: DataUpdateCoordinator[list[Plant]],
+    power_plant_id: str,
+) -> Plant | None:
+    """Return a power plant from coordinator data."""
+    index = get_coordinator_index(coordinator)
+    return index.power_plants.get(power_plant_id) if index else None
+
+
+def get_inverter(
+    coordinator: DataUpdateCoordinator[list[Plant]],
+    power_plant_id: str,
+    wn_id: str,
+) -> Inverter | None:
+    """Return an inverter from the device list in coordinator data."""
+    index = get_coordinator_index(coordinator)
+    return index.inverters.get((power_plant_id, wn_id)) if index else None
+
+
+def get_live_inverter(
+    coordinator: DataUpdateCoordinator[list[Plant]],
+    power_plant_id: str,
+    wn_id: str,
+) -> LiveInverter | None:
+    """Return one inverter entry from the live IoT data in coordinator data."""
+    index = get_coordinator_index(coordinator)
+    return index.live_inverters.get((power_plant_id, wn_id)) if index else None
+
+
+def get_live_power_limit_percent(
+    coordinator: DataUpdateCoordinator[list[Plant]],
     power_plant_id: str,
     wn_id: str,
-) -> dict[str, Any] | None:
-    """Return an inverter wnStationVo dict from coordinator data."""
-    power_plant = get_power_plant(coordinator, power_plant_id)
-    if not power_plant:
+) -> float | None:
+    """Return inverter power limit percent (param code 72) from coordinator data."""
+    index = get_coordinator_index(coordinator)
+    if not index:
+        return None
+    param = index.live_params.get((power_plant_id, wn_id, POWER_LIMIT_PARAM_CODE))
+    if not param or param.value is None:
         return None
-    for device in power_plant.get("devices", []):
-        wn = device.get("wnStationVo")
-        if wn and wn.get("wnId") == wn_id:
-            return wn
-    return None
+    return float(param.value)
 
 
-def inverter_input_sensor_description(
-    api_key: str,
-    translation_key: str,
-    device_class: SensorDeviceClass,
-    unit: str,
-) -> SensorEntityDescription:
-    """Build a sensor description for an inverter DC input reading."""
-    return SensorEntityDescription(
-        key=api_key,
-        translation_key=translation_key,
-        native_unit_of_measurement=unit,
-        device_class=device_class,
-        state_class=SensorStateClass.MEASUREMENT,
-    )
+@dataclass
+class StateWriteStats:
+    """Coordinator updates that wrote entity state, and those skipped as unchanged."""
+
+    written: int = 0
+    skipped: int = 0
+
+
+_STATE_WRITE_STATS: WeakKeyDictionary[DataUpdateCoordinator, StateWriteStats] = (
+    WeakKeyDictionary()
+)
+
+
+def get_state_write_stats(coordinator: DataUpdateCoordinator) -> StateWriteStats:
+    """Return the state write counters for a coordinator's entities."""
+    stats = _STATE_WRITE_STATS.get(coordinator)
+    if stats is None:
+        stats = _STATE_WRITE_STATS[coordinator] = StateWriteStats()
+    return stats
+
+
+class InvertechsCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it changed.
+
+    Most readings stay the same between polls; skipping those writes saves the state
+    machine update and the state_reported event for each of them.
+    """
+
+    _last_written_state: tuple[Any, ...] | None = None
+
+    def _current_state(self) -> tuple[Any, ...]:
+        return (self.available, self.state, self.extra_state_attributes)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._last_written_state = self._current_state()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the value, availability or attributes changed."""
+        stats = get_state_write_stats(self.coordinator)
+        if self._current_state() == self._last_written_state:
+            stats.skipped += 1
+            return
+        stats.written += 1
+        self.async_write_ha_state()
@@ -0,0 +1,285 @@
+"""Typed coordinator data parsed from Invertechs API payloads.
+
+Payloads are parsed once per refresh and only the fields the entities read are kept.
+The models are immutable, so refreshes build new objects and share the unchanged ones
+instead of copying nested dicts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from typing import Any
+
+from .entity import (
+    DEVICE_TYPE_INVERTER,
+    INVERTER_BINARY_SENSOR_DESCRIPTIONS,
+    INVERTER_INPUT_SENSOR_KEYS,
+    INVERTER_ONLINE_STATUS,
+    INVERTER_SENSOR_DESCRIPTIONS,
+    POWER_PLANT_BINARY_SENSOR_DESCRIPTIONS,
+    POWER_PLANT_SENSOR_DESCRIPTIONS,
+)
+
+POWER_PLANT_METRIC_KEYS: tuple[str, ...] = tuple(
+    description.key
+    for description in (*POWER_PLANT_SENSOR_DESCRIPTIONS, *POWER_PLANT_BINARY_SENSOR_DESCRIPTIONS)
+)
+
+INVERTER_READING_KEYS: tuple[str, ...] = (
+    *(description.key for description in INVERTER_SENSOR_DESCRIPTIONS),
+    *(
+        key
+        for input_keys in INVERTER_INPUT_SENSOR_KEYS
+        for key in (input_keys.voltage, input_keys.current, input_keys.power)
+    ),
+    INVERTER_BINARY_SENSOR_DESCRIPTIONS[1].key,
+)
+
+
+def _pick(payload: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    return {key: payload[key] for key in keys if key in payload}
+
+
+@dataclass(frozen=True, slots=True)
+class Param:
+    """One IoT parameter reported for an inverter."""
+
+    wn_id: str | None
+    code: str
+    value: Any
+
+    @classmethod
+    def from_api(cls, row: dict[str, Any]) -> Param:
+        return cls(row.get("wnId"), str(row.get("paramCode")), row.get("paramValue"))
+
+
+@dataclass(frozen=True, slots=True)
+class LiveInverter:
+    """One inverter entry from the IoT power info (wnVoList)."""
+
+    wn_id: str
+    online_status: int | None
+    model_version: str | None
+    software_version: str | None
+    hardware_version: str | None
+
+    @classmethod
+    def from_api(cls, row: dict[str, Any]) -> LiveInverter:
+        return cls(
+            row["wnId"],
+            row.get("onlineStatus"),
+            row.get("modelVersion"),
+            row.get("softwareVersion"),
+            row.get("hardwareVersion"),
+        )
+
+    @property
+    def is_online(self) -> bool:
+        return self.online_status == INVERTER_ONLINE_STATUS
+
+
+@dataclass(frozen=True, slots=True)
+class LiveData:
+    """Live IoT data for one plant."""
+
+    inverters: tuple[LiveInverter, ...] = ()
+    params: tuple[Param, ...] = ()
+
+    @classmethod
+    def from_api(cls, payload: Any) -> LiveData:
+        if not isinstance(payload, dict):
+            return cls()
+        return cls(
+            tuple(
+                LiveInverter.from_api(row)
+                for row in payload.get("wnVoList") or []
+                if row.get("wnId")
+            ),
+            tuple(Param.from_api(row) for row in payload.get("iotWnParams") or []),
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> LiveData:
+        return cls(
+            tuple(LiveInverter(**row) for row in data["inverters"]),
+            tuple(Param(**row) for row in data["params"]),
+        )
+
+    def inverter(self, wn_id: str) -> LiveInverter | None:
+        """Return the live entry for one inverter."""
+        for wn in self.inverters:
+            if wn.wn_id == wn_id:
+                return wn
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class InverterDetails:
+    """Parsed getWnDataDetails response."""
+
+    model: str | None
+    software_version: str | None
+    hardware_version: str | None
+    station_name: str | None
+    rated_power: Any
+    wn_type: int | None
+    readings: dict[str, Any]
+
+    @classmethod
+    def from_api(cls, payload: Any) -> InverterDetails | None:
+        if not isinstance(payload, dict):
+            return None
+        return cls(
+            payload.get("model", "Unknown"),
+            payload.get("softwareVersion"),
+            payload.get("hardwareVersion"),
+            payload.get("stationName"),
+            payload.get("ratedPower"),
+            payload.get("wnType"),
+            _pick(payload, INVERTER_READING_KEYS),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Inverter:
+    """One inverter from a plant's device list, with its latest details."""
+
+    wn_id: str
+    pd_month: str
+    valid_date: str | None
+    alarm_status: Any
+    details: InverterDetails | None = None
+
+    @classmethod
+    def from_api(cls, row: dict[str, Any]) -> Inverter:
+        """Build an inverter from a device list wnStationVo entry."""
+        return cls(
+            row["wnId"],
+            row.get("pdMonth", ""),
+            row.get("validDate"),
+            row.get("alarmStatus"),
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Inverter:
+        details = data["details"]
+        return cls(
+            **{**data, "details": InverterDetails(**details) if details is not None else None}
+        )
+
+    @property
+    def model(self) -> str:
+        return self.details.model if self.details else "Unknown"
+
+    def reading(self, key: str) -> Any:
+        """Return a detail reading; the alarm status falls back to the device list."""
+        if self.details is not None and key in self.details.readings:
+            return self.details.readings[key]
+        return self.alarm_status if key == "alarmStatus" else None
+
+    def with_details(self, payload: Any) -> Inverter:
+        return replace(self, details=InverterDetails.from_api(payload))
+
+
+@dataclass(frozen=True, slots=True)
+class Plant:
+    """One power plant with its metrics, live IoT data and inverters.
+
+    details is None until station details were loaded; live is only set by the fast
+    cycle and inverters only by the device cycle. stale_since is set while the plant is
+    last good data kept after its station failed to refresh.
+    """
+
+    id: str
+    name: str | None
+    create_time: str | None
+    address: str | None
+    capacity: Any
+    wn_num: int | None
+    exists_meter: Any
+    exists_battery: Any
+    station_metrics: dict[str, Any]
+    details: dict[str, Any] | None = None
+    live: LiveData | None = None
+    inverters: tuple[Inverter, ...] | None = None
+    stale_since: datetime | None = None
+
+    @classmethod
+    def from_api(cls, station: dict[str, Any], details: Any = None) -> Plant:
+        """Build a plant from a station list row and its station details payload."""
+        return cls(
+            station["id"],
+            station.get("stationName"),
+            station.get("createTime"),
+            station.get("stationAddress"),
+            station.get("capacity"),
+            station.get("wnNum"),
+            station.get("existsMeter"),
+            station.get("existsBattery"),
+            _pick(station, POWER_PLANT_METRIC_KEYS),
+            _parse_plant_details(details),
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Plant:
+        live = data["live"]
+        inverters = data["inverters"]
+        stale_since = data.get("stale_since")
+        return cls(
+            **{
+                **data,
+                "live": LiveData.from_json(live) if live is not None else None,
+                "inverters": (
+                    tuple(Inverter.from_json(row) for row in inverters)
+                    if inverters is not None
+                    else None
+                ),
+                "stale_since": (
+                    datetime.fromisoformat(stale_since)
+                    if isinstance(stale_since, str)
+                    else stale_since
+                ),
+            }
+        )
+
+    def metric(self, key: str) -> Any:
+        """Return a plant metric from station details, falling back to the station list."""
+        if self.details and self.details.get(key) is not None:
+            return self.details[key]
+        return self.station_metrics.get(key)
+
+    def with_readings(self, details: Any, live: LiveData) -> Plant:
+        """Return the plant with new station details and live data; the rest is shared."""
+        return replace(self, details=_parse_plant_details(details), live=live, stale_since=None)
+
+
+def _parse_plant_details(payload: Any) -> dict[str, Any] | None:
+    if not payload or not isinstance(payload, dict):
+        return None
+    return _pick(payload, POWER_PLANT_METRIC_KEYS)
+
+
+def inverters_from_devices(devices: list[dict[str, Any]]) -> tuple[Inverter, ...]:
+    """Return the inverters in a getDevicesListInsideStation response."""
+    return tuple(
+        Inverter.from_api(device["wnStationVo"])
+        for device in devices
+        if device.get("devicesType") == DEVICE_TYPE_INVERTER
+        and device.get("wnStationVo")
+        and device["wnStationVo"].get("wnId")
+    )
+
+
+def plants_to_json(plants: list[Plant] | None) -> list[dict[str, Any]] | None:
+    """Return plants as JSON-compatible dicts for storage."""
+    if plants is None:
+        return None
+    return [asdict(plant) for plant in plants]
+
+
+def plants_from_json(data: Any) -> list[Plant] | None:
+    """Rebuild plants written by plants_to_json."""
+    if not isinstance(data, list):
+        return None
+    return [Plant.from_json(row) for row in data]
@@ -9,7 +9,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .client import InvertechsApiError, InvertechsAuthError, InvertechsError
 from .const import (
@@ -17,31 +16,20 @@ from .const import (
     POWER_LIMIT_MAX_PERCENT,
     POWER_LIMIT_MIN_PERCENT,
 )
-from .discovery import EntityDiscoveryState, discover_inverter_power_limit_entities
-from .entity import get_inverter_power_limit_percent, get_power_plant
+from .discovery import discover_inverter_power_limit_entities
+from .entity import InvertechsCoordinatorEntity, get_live_power_limit_percent
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     """Set up Invertechs number entities."""
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    fast_coordinator = entry_data["fast_coordinator"]
-    discovery_state = EntityDiscoveryState()
+    hass.data[DOMAIN][entry.entry_id]["discovery"].async_add_platform(
+        async_add_entities, fast=(discover_inverter_power_limit_entities,)
+    )
 
-    @callback
-    def _add_entities() -> None:
-        entities = discover_inverter_power_limit_entities(
-            fast_coordinator, entry, discovery_state
-        )
-        if entities:
-            async_add_entities(entities)
-
-    _add_entities()
-    entry.async_on_unload(fast_coordinator.async_add_listener(_add_entities))
 
-
-class InvertechsInverterPowerLimitNumber(CoordinatorEntity, NumberEntity):
+class InvertechsInverterPowerLimitNumber(InvertechsCoordinatorEntity, NumberEntity):
     """Set the inverter active power limit (percent of rated power)."""
 
     _attr_has_entity_name = True
@@ -70,10 +58,9 @@ class InvertechsInverterPowerLimitNumber(CoordinatorEntity, NumberEntity):
 
     def _reported_percent(self) -> int | None:
         """Return the power limit currently reported by the API (whole percent)."""
-        power_plant = get_power_plant(self.coordinator, self._power_plant_id)
-        if not power_plant:
-            return None
-        value = get_inverter_power_limit_percent(power_plant, self._wn_id)
+        value = get_live_power_limit_percent(
+            self.coordinator, self._power_plant_id, self._wn_id
+        )
         return round(value) if value is not None else None
 
     async def async_added_to_hass(self) -> None:
@@ -85,7 +72,7 @@ class InvertechsInverterPowerLimitNumber(CoordinatorEntity, NumberEntity):
     def _handle_coordinator_update(self) -> None:
         """Keep the slider aligned with the last API reading."""
         self._attr_native_value = self._reported_percent()
-        self.async_write_ha_state()
+        super()._handle_coordinator_update()
 
     @callback
     def _restore_reported_value(self, value: int | None) -> None:
@@ -1,80 +1,317 @@
-"""Adaptive polling intervals based on inverter connectivity."""
+"""Adaptive per-station polling based on inverter connectivity."""
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
 import logging
+import random
+import time
 from typing import Any
+import zlib
 
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.sun import get_astral_event_next
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
-from .const import FAST_UPDATE_INTERVAL, OFFLINE_UPDATE_INTERVAL
-from .entity import account_inverters_are_online
+from .const import (
+    CONNECTIVITY_HYSTERESIS_READINGS,
+    DAWN_PREWARM,
+    DAWN_PROBE_INTERVAL,
+    DAWN_RAMP,
+    FAST_UPDATE_INTERVAL,
+    NIGHT_PROBE_MAX_INTERVAL,
+    OFFLINE_PROBE_MAX_INTERVAL,
+    OFFLINE_UPDATE_INTERVAL,
+)
+from .entity import inverters_are_online
+from .models import Plant
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def should_reduce_fast_polling(entry_data: dict[str, Any]) -> bool:
-    """Return True when the fast coordinator should use offline sleep mode."""
-    if entry_data.get("inverters_online", True):
-        return False
-    return entry_data.get("offline_fast_snapshot_taken", False)
+class StationPollMode(Enum):
+    """How a station is fetched in one coordinator cycle."""
 
+    FULL = "full"
+    # Station refresh plus an IoT probe that falls back to cached live data.
+    REDUCED = "reduced"
+    # Cached plant reused without requests.
+    SKIP = "skip"
 
-def should_reduce_device_polling(entry_data: dict[str, Any]) -> bool:
-    """Return True when the device coordinator should use offline sleep mode."""
-    if entry_data.get("inverters_online", True):
-        return False
-    return entry_data.get("offline_device_snapshot_taken", False)
+
+class SunPhase(Enum):
+    """Part of the day at the Home Assistant location, for offline probing."""
+
+    DAY = "day"
+    NIGHT = "night"
+    # From DAWN_PREWARM before sunrise until DAWN_RAMP after it.
+    DAWN = "dawn"
+
+
+def sun_phase(hass: HomeAssistant | None) -> tuple[SunPhase, datetime | None]:
+    """Return the current sun phase and when the next dawn window starts."""
+    if hass is None:
+        return SunPhase.DAY, None
+    now = dt_util.utcnow()
+    sunrise = get_astral_event_next(hass, SUN_EVENT_SUNRISE, now - DAWN_RAMP)
+    dawn_start = sunrise - DAWN_PREWARM
+    if now >= dawn_start:
+        return SunPhase.DAWN, dawn_start
+    if get_astral_event_next(hass, SUN_EVENT_SUNSET, now) < sunrise:
+        return SunPhase.DAY, dawn_start
+    return SunPhase.NIGHT, dawn_start
+
+
+@dataclass
+class StationPollState:
+    """Connectivity and snapshot state of one station."""
+
+    online: bool = True
+    offline_fast_snapshot_taken: bool = False
+    offline_device_snapshot_taken: bool = False
+    next_offline_poll: float = 0.0
+    offline_probes: int = 0
+    # Consecutive readings that disagree with online; a switch needs enough of them.
+    contrary_readings: int = 0
+
+
+@dataclass
+class StationScheduler:
+    """Per-station polling: online stations at the fast rate, offline ones rarely.
+
+    A station switches between online and offline only after
+    CONNECTIVITY_HYSTERESIS_READINGS consecutive readings agree, so flapping inverters
+    do not toggle its polling. A station that goes offline gets one final full fast and
+    device snapshot. After that, its fast polls are reduced to IoT probes that back off
+    exponentially from OFFLINE_UPDATE_INTERVAL (up to OFFLINE_PROBE_MAX_INTERVAL by day
+    and NIGHT_PROBE_MAX_INTERVAL at night, from the sun at the hass location), and its
+    device polls are skipped. Around sunrise the probes run every DAWN_PROBE_INTERVAL so
+    the first readings of the day are not missed.
+
+    With a stagger_window, the requests of a fast cycle are spread across that window
+    instead of being sent at once.
+    """
+
+    hass: HomeAssistant | None = None
+    stations: dict[str, StationPollState] = field(default_factory=dict)
+    stagger_window: timedelta | None = None
+
+    def fast_modes(self, station_ids: Iterable[str]) -> dict[str, StationPollMode]:
+        """Return the fast cycle mode of each known station."""
+        now = time.monotonic()
+        modes: dict[str, StationPollMode] = {}
+        for station_id in station_ids:
+            state = self.stations.get(station_id)
+            if state is None or state.online or not state.offline_fast_snapshot_taken:
+                modes[station_id] = StationPollMode.FULL
+            elif now >= state.next_offline_poll:
+                modes[station_id] = StationPollMode.REDUCED
+            else:
+                modes[station_id] = StationPollMode.SKIP
+        return modes
+
+    def fast_start_delays(self, modes: dict[str, StationPollMode]) -> dict[str, float]:
+        """Return seconds each polled station waits before its fast cycle requests.
+
+        Polled stations get evenly spaced slots across stagger_window, in a stable order
+        hashed from their IDs, and start at a random point within their slot. Empty
+        without staggering, and stations missing from modes start at once.
+        """
+        if self.stagger_window is None:
+            return {}
+        polled = sorted(
+            (
+                station_id
+                for station_id, mode in modes.items()
+                if mode is not StationPollMode.SKIP
+            ),
+            key=_station_phase,
+        )
+        if not polled:
+            return {}
+        slot = self.stagger_window.total_seconds() / len(polled)
+        return {
+            station_id: (position + random.random()) * slot
+            for position, station_id in enumerate(polled)
+        }
+
+    def device_modes(self, station_ids: Iterable[str]) -> dict[str, StationPollMode]:
+        """Return the device cycle mode of each known station."""
+        modes: dict[str, StationPollMode] = {}
+        for station_id in station_ids:
+            state = self.stations.get(station_id)
+            if state is not None and not state.online and state.offline_device_snapshot_taken:
+                modes[station_id] = StationPollMode.SKIP
+            else:
+                modes[station_id] = StationPollMode.FULL
+        return modes
+
+    def record_fast(
+        self,
+        power_plants: list[Plant],
+        modes: dict[str, StationPollMode],
+    ) -> bool:
+        """Update station states from a fast refresh.
+
+        Returns True when a station went offline and needs its final device snapshot.
+        """
+        now = time.monotonic()
+        phase, dawn_start = sun_phase(self.hass)
+        needs_device_snapshot = False
+        for power_plant in power_plants:
+            mode = modes.get(power_plant.id, StationPollMode.FULL)
+            if mode is StationPollMode.SKIP:
+                continue
+            state = self.stations.setdefault(power_plant.id, StationPollState())
+            online = inverters_are_online(power_plant)
+            if online == state.online:
+                state.contrary_readings = 0
+            elif state.contrary_readings + 1 < CONNECTIVITY_HYSTERESIS_READINGS:
+                state.contrary_readings += 1
+                _LOGGER.debug(
+                    "Station %s reads %s (%s of %s readings needed to switch)",
+                    power_plant.id,
+                    "online" if online else "offline",
+                    state.contrary_readings,
+                    CONNECTIVITY_HYSTERESIS_READINGS,
+                )
+            elif online:
+                _LOGGER.debug("Station %s is online; resuming full polling", power_plant.id)
+                self.stations[power_plant.id] = StationPollState()
+                continue
+            else:
+                _LOGGER.debug(
+                    "Station %s went offline; keeping full polling for one final snapshot",
+                    power_plant.id,
+                )
+                state.online = False
+                state.contrary_readings = 0
+                state.offline_device_snapshot_taken = False
+                needs_device_snapshot = True
+            if state.online:
+                continue
+            state.offline_fast_snapshot_taken = True
+            if state.contrary_readings:
+                # Confirm an online reading at the fast rate instead of backing off.
+                state.next_offline_poll = now + FAST_UPDATE_INTERVAL.total_seconds()
+            else:
+                state.next_offline_poll = now + _offline_probe_delay(state, phase, dawn_start)
+        # Stations no longer in the list are forgotten.
+        for station_id in self.stations.keys() - {plant.id for plant in power_plants}:
+            del self.stations[station_id]
+        return needs_device_snapshot
+
+    def record_device(
+        self,
+        power_plants: list[Plant],
+        modes: dict[str, StationPollMode],
+    ) -> None:
+        """Mark the final device snapshot of offline stations fetched in a device cycle."""
+        for power_plant in power_plants:
+            state = self.stations.get(power_plant.id)
+            if (
+                state is None
+                or state.online
+                or state.offline_device_snapshot_taken
+                or modes.get(power_plant.id, StationPollMode.FULL) is not StationPollMode.FULL
+            ):
+                continue
+            state.offline_device_snapshot_taken = True
+            _LOGGER.debug(
+                "Offline device snapshot complete for station %s; device polling paused",
+                power_plant.id,
+            )
+
+    def fast_interval(self) -> timedelta:
+        """Return the fast tick interval.
+
+        The fast rate is used while any station is online or still due its offline
+        snapshot; otherwise the tick waits until the next offline probe is due. With
+        staggering, the fast rate is shortened by the stagger window the cycle spends
+        spreading its requests, so each station is still fetched about once per
+        FAST_UPDATE_INTERVAL.
+        """
+        if not self.stations or any(
+            state.online or not state.offline_fast_snapshot_taken
+            for state in self.stations.values()
+        ):
+            if self.stagger_window is not None:
+                return FAST_UPDATE_INTERVAL - self.stagger_window
+            return FAST_UPDATE_INTERVAL
+        delay = min(state.next_offline_poll for state in self.stations.values()) - time.monotonic()
+        return timedelta(
+            seconds=round(
+                min(
+                    max(delay, FAST_UPDATE_INTERVAL.total_seconds()),
+                    NIGHT_PROBE_MAX_INTERVAL.total_seconds(),
+                )
+            )
+        )
+
+    @property
+    def pending_device_snapshots(self) -> set[str]:
+        """Return offline stations whose final device snapshot was not fetched yet."""
+        return {
+            station_id
+            for station_id, state in self.stations.items()
+            if not state.online and not state.offline_device_snapshot_taken
+        }
+
+    @property
+    def online_stations(self) -> int:
+        return sum(state.online for state in self.stations.values())
 
 
 def update_polling_after_fast(
     entry_data: dict[str, Any],
     fast_coordinator: DataUpdateCoordinator,
     device_coordinator: DataUpdateCoordinator,
-    power_plants: list[dict[str, Any]],
+    power_plants: list[Plant],
+    modes: dict[str, StationPollMode],
 ) -> None:
-    """Adjust polling state after a fast coordinator refresh."""
-    now_online = account_inverters_are_online(power_plants)
-    was_online = entry_data.get("inverters_online", True)
-
-    if now_online:
-        entry_data["inverters_online"] = True
-        entry_data["offline_fast_snapshot_taken"] = False
-        entry_data["offline_device_snapshot_taken"] = False
-        entry_data["reduced_polling"] = False
-        fast_interval = FAST_UPDATE_INTERVAL
-    else:
-        entry_data["inverters_online"] = False
-        if was_online:
-            _LOGGER.debug(
-                "Inverters went offline; keeping full polling for one final snapshot"
-            )
-            entry_data["offline_fast_snapshot_taken"] = True
-            entry_data["offline_device_snapshot_taken"] = False
-            device_coordinator.async_request_refresh()
-        elif not entry_data.get("offline_fast_snapshot_taken", False):
-            entry_data["offline_fast_snapshot_taken"] = True
-
-        entry_data["reduced_polling"] = (
-            entry_data.get("offline_fast_snapshot_taken", False)
-            and entry_data.get("offline_device_snapshot_taken", False)
-        )
-        fast_interval = OFFLINE_UPDATE_INTERVAL
+    """Update station states and the fast tick after a fast coordinator refresh."""
+    scheduler: StationScheduler = entry_data["scheduler"]
+    if scheduler.record_fast(power_plants, modes):
+        device_coordinator.hass.async_create_task(device_coordinator.async_request_refresh())
 
+    fast_interval = scheduler.fast_interval()
     if fast_coordinator.update_interval != fast_interval:
         fast_coordinator.update_interval = fast_interval
         _LOGGER.debug(
-            "Fast polling interval set to %s (inverters_online=%s)",
+            "Fast polling interval set to %s (%s of %s stations online)",
             fast_interval,
-            now_online,
+            scheduler.online_stations,
+            len(scheduler.stations),
         )
 
 
-def mark_device_offline_snapshot(entry_data: dict[str, Any]) -> None:
-    """Mark the final device detail fetch complete after going offline."""
-    if entry_data.get("inverters_online", True):
-        return
+def _station_phase(station_id: str) -> int:
+    """Return a hash of the station ID that is stable across restarts."""
+    return zlib.crc32(str(station_id).encode())
+
 
-    entry_data["offline_device_snapshot_taken"] = True
-    entry_data["reduced_polling"] = entry_data.get("offline_fast_snapshot_taken", False)
-    _LOGGER.debug("Offline device snapshot complete; device polling paused")
+def _offline_probe_delay(
+    state: StationPollState,
+    phase: SunPhase,
+    dawn_start: datetime | None,
+) -> float:
+    """Return seconds until an offline station is probed again, backing off per probe."""
+    if phase is SunPhase.DAWN:
+        state.offline_probes = 0
+        return DAWN_PROBE_INTERVAL.total_seconds()
+    cap = NIGHT_PROBE_MAX_INTERVAL if phase is SunPhase.NIGHT else OFFLINE_PROBE_MAX_INTERVAL
+    delay = min(
+        OFFLINE_UPDATE_INTERVAL.total_seconds() * 2 ** min(state.offline_probes, 16),
+        cap.total_seconds(),
+    )
+    state.offline_probes += 1
+    if phase is SunPhase.NIGHT and dawn_start is not None:
+        # Wake up for the dawn window even in the middle of a long backoff.
+        until_dawn = (dawn_start - dt_util.utcnow()).total_seconds()
+        delay = max(FAST_UPDATE_INTERVAL.total_seconds(), min(delay, until_dawn))
+    return delay
@@ -0,0 +1,144 @@
+"""Priority admission of requests to the Invertechs cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+import itertools
+import time
+
+from .const import API_ENDPOINT_PRIORITIES, API_PRIORITY_AGING
+
+
+class RequestPriority(IntEnum):
+    """Request classes, served lowest value first."""
+
+    # Power limit writes and login, which every other request may be waiting on.
+    WRITE = 0
+    # IoT power info behind the connection sensors and power limit numbers.
+    LIVE = 1
+    # Station refresh and the station list.
+    REFRESH = 2
+    # Station details, device lists and inverter details.
+    BULK = 3
+
+
+def priority_for_path(path: str) -> RequestPriority:
+    """Return the request class of an API endpoint."""
+    return RequestPriority(API_ENDPOINT_PRIORITIES.get(path, RequestPriority.BULK))
+
+
+@dataclass
+class PriorityClassStats:
+    """Queue counters of one request class exposed through diagnostics."""
+
+    requests: int = 0
+    delayed_requests: int = 0
+    # Requests admitted ahead of a higher class because they waited too long.
+    aged_requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+@dataclass
+class _Waiter:
+    priority: RequestPriority
+    queued_at: float
+    sequence: int
+    future: asyncio.Future[None] = field(repr=False)
+    granted: bool = False
+
+
+class PriorityRequestQueue:
+    """Admit requests by class, within a total and a per-class concurrency limit.
+
+    Free slots go to the queued request with the best class, first in first out within
+    a class. A queued request moves up one class for every API_PRIORITY_AGING seconds it
+    waits, so a steady stream of live polls cannot starve detail requests.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        class_limits: tuple[int, ...],
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.class_limits = dict(zip(RequestPriority, class_limits))
+        self.stats = {priority: PriorityClassStats() for priority in RequestPriority}
+        self.in_flight = dict.fromkeys(RequestPriority, 0)
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Hold a request slot of the given class."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        waiter = _Waiter(
+            priority,
+            time.monotonic(),
+            next(self._sequence),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.granted:
+                self._release(priority)
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.queued_at
+        stats = self.stats[priority]
+        stats.requests += 1
+        if waited > 0.001:
+            stats.delayed_requests += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+
+    def _release(self, priority: RequestPriority) -> None:
+        self.in_flight[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to queued requests in priority order."""
+        while self._waiters and sum(self.in_flight.values()) < self.max_concurrent:
+            now = time.monotonic()
+            eligible = [
+                waiter
+                for waiter in self._waiters
+                # A cancelled waiter is removed once its task resumes.
+                if not waiter.future.cancelled()
+                and self.in_flight[waiter.priority] < self.class_limits[waiter.priority]
+            ]
+            if not eligible:
+                return
+            waiter = min(
+                eligible, key=lambda waiter: (self._rank(waiter, now), waiter.sequence)
+            )
+            if any(other.priority < waiter.priority for other in eligible):
+                self.stats[waiter.priority].aged_requests += 1
+            self._waiters.remove(waiter)
+            self.in_flight[waiter.priority] += 1
+            waiter.granted = True
+            waiter.future.set_result(None)
+
+    @staticmethod
+    def _rank(waiter: _Waiter, now: float) -> int:
+        """Return the class a request competes in after aging."""
+        return max(0, waiter.priority - int((now - waiter.queued_at) // API_PRIORITY_AGING))
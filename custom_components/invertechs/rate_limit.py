@@ -0,0 +1,60 @@
+"""Client-side request rate limiting for the Invertechs cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import time
+
+
+@dataclass
+class RateLimiterStats:
+    """Queue wait counters exposed through diagnostics."""
+
+    requests: int = 0
+    delayed_requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class TokenBucket:
+    """Token bucket; callers waiting for a token are served in arrival order."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.stats = RateLimiterStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # asyncio.Lock wakes waiters first in, first out, which keeps the queue fair.
+        self._lock = asyncio.Lock()
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the rate and burst size, keeping the tokens already refilled."""
+        self._refill()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = min(self._tokens, float(burst))
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the time spent waiting."""
+        queued_at = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+        waited = time.monotonic() - queued_at
+        self.stats.requests += 1
+        if waited > 0.001:
+            self.stats.delayed_requests += 1
+            self.stats.total_wait += waited
+            self.stats.max_wait = max(self.stats.max_wait, waited)
+        return waited
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
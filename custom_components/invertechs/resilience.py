@@ -0,0 +1,94 @@
+"""Retry backoff and circuit breaking for the Invertechs cloud API."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import random
+import time
+
+from .const import (
+    API_BACKOFF_BASE,
+    API_BACKOFF_MAX,
+    API_CIRCUIT_FAILURE_THRESHOLD,
+    API_CIRCUIT_OPEN_MAX,
+    API_CIRCUIT_OPEN_MIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter delay before retry number attempt (0-based)."""
+    return random.uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2**attempt))
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Breaker counters exposed through diagnostics."""
+
+    opened: int = 0
+    rejected_requests: int = 0
+
+
+class CircuitBreaker:
+    """Stop calling a region's API after repeated transient failures.
+
+    The circuit opens after API_CIRCUIT_FAILURE_THRESHOLD consecutive failures. Once the
+    open period ends one trial request is let through; if it fails the circuit opens
+    again for twice as long, up to API_CIRCUIT_OPEN_MAX.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = CircuitBreakerStats()
+        self._failures = 0
+        self._open_until = 0.0
+        self._open_for = float(API_CIRCUIT_OPEN_MIN)
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests would be rejected."""
+        if self._failures < API_CIRCUIT_FAILURE_THRESHOLD:
+            return False
+        return self._trial_in_flight or time.monotonic() < self._open_until
+
+    def allow_request(self) -> bool:
+        """Return True when a request may be sent now."""
+        if self._failures < API_CIRCUIT_FAILURE_THRESHOLD:
+            return True
+        if self._trial_in_flight or time.monotonic() < self._open_until:
+            self.stats.rejected_requests += 1
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self._failures >= API_CIRCUIT_FAILURE_THRESHOLD:
+            _LOGGER.info("Invertechs API (%s) reachable again; circuit closed", self.name)
+        self._failures = 0
+        self._open_for = float(API_CIRCUIT_OPEN_MIN)
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures < API_CIRCUIT_FAILURE_THRESHOLD:
+            return
+        if self._trial_in_flight:
+            self._open_for = min(self._open_for * 2, API_CIRCUIT_OPEN_MAX)
+            self._trial_in_flight = False
+        elif time.monotonic() < self._open_until:
+            # Late failure of a request sent before the circuit opened.
+            return
+        self._open_until = time.monotonic() + self._open_for
+        self.stats.opened += 1
+        _LOGGER.warning(
+            "Invertechs API (%s) failing; pausing requests for %.0f s",
+            self.name,
+            self._open_for,
+        )
+
+    def release_trial(self) -> None:
+        """Let another request probe the API after a trial ended without a verdict."""
+        self._trial_in_flight = False
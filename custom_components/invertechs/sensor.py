@@ -1,50 +1,22 @@
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .discovery import (
-    EntityDiscoveryState,
-    discover_inverter_sensor_entities,
-    discover_power_plant_sensor_entities,
-)
-from .entity import (
-    get_inverter_wn,
-    get_power_plant,
-    get_power_plant_value,
-    power_plant_device_info,
-)
+from .discovery import discover_inverter_sensor_entities, discover_power_plant_sensor_entities
+from .entity import InvertechsCoordinatorEntity, get_inverter, get_power_plant
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     """Set up Invertechs sensors."""
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    coordinator = entry_data["coordinator"]
-    fast_coordinator = entry_data["fast_coordinator"]
-    discovery_state = EntityDiscoveryState()
+    hass.data[DOMAIN][entry.entry_id]["discovery"].async_add_platform(
+        async_add_entities,
+        fast=(discover_power_plant_sensor_entities,),
+        devices=(discover_inverter_sensor_entities,),
+    )
 
-    @callback
-    def _add_fast_entities() -> None:
-        entities = discover_power_plant_sensor_entities(
-            fast_coordinator, entry, discovery_state
-        )
-        if entities:
-            async_add_entities(entities)
 
-    @callback
-    def _add_device_entities() -> None:
-        entities = discover_inverter_sensor_entities(coordinator, entry, discovery_state)
-        if entities:
-            async_add_entities(entities)
-
-    _add_fast_entities()
-    _add_device_entities()
-    entry.async_on_unload(fast_coordinator.async_add_listener(_add_fast_entities))
-    entry.async_on_unload(coordinator.async_add_listener(_add_device_entities))
-
-
-class InvertechsPowerPlantSensor(CoordinatorEntity, SensorEntity):
+class InvertechsPowerPlantSensor(InvertechsCoordinatorEntity, SensorEntity):
     """Sensor for a power plant reading."""
 
     _attr_has_entity_name = True
@@ -54,24 +26,25 @@ class InvertechsPowerPlantSensor(CoordinatorEntity, SensorEntity):
         self,
         coordinator,
         entry: ConfigEntry,
-        power_plant: dict,
+        power_plant_id: str,
+        device_info,
         description: SensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self.entity_description = description
-        self._power_plant_id = power_plant["id"]
-        self._attr_unique_id = f"{entry.entry_id}_{power_plant['id']}_{description.key}"
-        self._attr_device_info = power_plant_device_info(power_plant)
+        self._power_plant_id = power_plant_id
+        self._attr_unique_id = f"{entry.entry_id}_{power_plant_id}_{description.key}"
+        self._attr_device_info = device_info
 
     @property
     def native_value(self):
         power_plant = get_power_plant(self.coordinator, self._power_plant_id)
         if not power_plant:
             return None
-        return get_power_plant_value(power_plant, self.entity_description.key)
+        return power_plant.metric(self.entity_description.key)
 
 
-class InvertechsInverterSensor(CoordinatorEntity, SensorEntity):
+class InvertechsInverterSensor(InvertechsCoordinatorEntity, SensorEntity):
     """Sensor for an inverter reading from detail polling."""
 
     _attr_has_entity_name = True
@@ -95,7 +68,7 @@ class InvertechsInverterSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        wn = get_inverter_wn(self.coordinator, self._power_plant_id, self._wn_id)
-        if not wn:
+        inverter = get_inverter(self.coordinator, self._power_plant_id, self._wn_id)
+        if not inverter or not inverter.details:
             return None
-        return wn.get("details", {}).get(self.entity_description.key)
+        return inverter.details.readings.get(self.entity_description.key)
@@ -0,0 +1,114 @@
+"""Pooled HTTP sessions and request limits shared by config entries of the same region."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import sys
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    API_CONNECTION_LIMIT,
+    API_DNS_CACHE_TTL,
+    API_KEEPALIVE_TIMEOUT,
+    API_MAX_CONCURRENT_REQUESTS,
+    API_PRIORITY_CLASS_LIMITS,
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_PER_SECOND,
+    DOMAIN,
+)
+from .priority import PriorityRequestQueue
+from .rate_limit import TokenBucket
+from .resilience import CircuitBreaker
+
+SESSIONS_KEY = f"{DOMAIN}_sessions"
+# Python 3.12.7 and 3.13.1 fixed the SSL transport leak this works around, and aiohttp
+# warns when it is set there; same check as Home Assistant's aiohttp_client.
+ENABLE_CLEANUP_CLOSED = sys.version_info < (3, 12, 7) or (
+    (3, 13, 0) <= sys.version_info < (3, 13, 1)
+)
+
+
+@dataclass
+class RegionSession:
+    """HTTP session, rate limiter, circuit breaker and request queue of one region."""
+
+    session: aiohttp.ClientSession
+    rate_limiter: TokenBucket
+    circuit_breaker: CircuitBreaker
+    request_queue: PriorityRequestQueue
+    remove_close_listener: Callable[[], None]
+    # Rate and burst requested by each config entry using the region.
+    rate_limits: dict[str, tuple[float, int]] = field(default_factory=dict)
+
+    def apply_rate_limits(self) -> None:
+        """Size the shared token bucket for the most demanding entry of the region."""
+        if self.rate_limits:
+            self.rate_limiter.configure(
+                max(rate for rate, _ in self.rate_limits.values()),
+                max(burst for _, burst in self.rate_limits.values()),
+            )
+
+
+@callback
+def async_acquire_region_session(
+    hass: HomeAssistant,
+    region: str,
+    entry_id: str,
+    rate: float = API_RATE_LIMIT_PER_SECOND,
+    burst: int = API_RATE_LIMIT_BURST,
+) -> RegionSession:
+    """Return the region's shared session and limits, creating them on first use.
+
+    They live until the last config entry of the region releases them, so a reload of
+    every entry starts with a fresh rate limiter and circuit breaker.
+    """
+    sessions: dict[str, RegionSession] = hass.data.setdefault(SESSIONS_KEY, {})
+    shared = sessions.get(region)
+    if shared is None or shared.session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=API_CONNECTION_LIMIT,
+                limit_per_host=API_CONNECTION_LIMIT,
+                ttl_dns_cache=API_DNS_CACHE_TTL,
+                keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=ENABLE_CLEANUP_CLOSED,
+                ssl=get_default_context(),
+            ),
+        )
+
+        async def _async_close(event: Event) -> None:
+            await session.close()
+
+        shared = sessions[region] = RegionSession(
+            session,
+            TokenBucket(API_RATE_LIMIT_PER_SECOND, API_RATE_LIMIT_BURST),
+            CircuitBreaker(region),
+            PriorityRequestQueue(API_MAX_CONCURRENT_REQUESTS, API_PRIORITY_CLASS_LIMITS),
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close),
+        )
+    shared.rate_limits[entry_id] = (rate, burst)
+    shared.apply_rate_limits()
+    return shared
+
+
+async def async_release_region_session(
+    hass: HomeAssistant, region: str, entry_id: str
+) -> None:
+    """Drop one entry from the region's session and close it when none are left."""
+    sessions: dict[str, RegionSession] = hass.data.get(SESSIONS_KEY, {})
+    shared = sessions.get(region)
+    if shared is None:
+        return
+    shared.rate_limits.pop(entry_id, None)
+    if shared.rate_limits:
+        shared.apply_rate_limits()
+        return
+    del sessions[region]
+    shared.remove_close_listener()
+    await shared.session.close()
@@ -0,0 +1,132 @@
+"""Persisted session token and coordinator snapshot for warm starts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .client import InvertechsClient
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .models import plants_from_json, plants_to_json
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _SnapshotStore(Store[dict[str, Any]]):
+    """Store that drops plant data written in an older format."""
+
+    _save_scheduled = False
+
+    @callback
+    def async_delay_save_once(
+        self, data_func: Callable[[], dict[str, Any]], delay: float
+    ) -> None:
+        """Schedule a delayed save unless one is already pending.
+
+        async_delay_save restarts its timer on every call, so calling it after every
+        fast update would keep pushing the write back until shutdown.
+        """
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+
+        def _data() -> dict[str, Any]:
+            self._save_scheduled = False
+            return data_func()
+
+        self.async_delay_save(_data, delay)
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        # Saving now cancels a pending delayed save.
+        self._save_scheduled = False
+        await super().async_save(data)
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        # Version 1 held raw API payloads; keep the session and refetch the plants.
+        return {**old_data, "fast": None, "devices": None}
+
+
+def create_snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> _SnapshotStore:
+    """Return the storage helper for one config entry."""
+    return _SnapshotStore(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+async def async_load_snapshot(
+    store: Store[dict[str, Any]],
+    client: InvertechsClient,
+    entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return the stored snapshot when it belongs to the entry's account and region."""
+    try:
+        data = await store.async_load()
+    except HomeAssistantError:
+        _LOGGER.warning("Could not load stored snapshot for %s", entry.title, exc_info=True)
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+    if (
+        data.get("email") != entry.data[CONF_EMAIL].lower()
+        or data.get("region") != client.region
+    ):
+        _LOGGER.debug("Ignoring stored snapshot for a different account or region")
+        return {}
+    try:
+        return {
+            **data,
+            "fast": plants_from_json(data.get("fast")),
+            "devices": plants_from_json(data.get("devices")),
+        }
+    except (KeyError, TypeError):
+        _LOGGER.debug("Ignoring unreadable plant data in stored snapshot", exc_info=True)
+        return {**data, "fast": None, "devices": None}
+
+
+@callback
+def async_schedule_snapshot_save(
+    store: _SnapshotStore,
+    client: InvertechsClient,
+    entry: ConfigEntry,
+    entry_data: dict[str, Any],
+) -> None:
+    """Write the token and cached coordinator data within SNAPSHOT_SAVE_DELAY.
+
+    Data is read when the write happens, so later updates join the pending save, and the
+    Store flushes a pending save when Home Assistant shuts down.
+    """
+    store.async_delay_save_once(
+        lambda: _snapshot_data(client, entry, entry_data), SNAPSHOT_SAVE_DELAY
+    )
+
+
+async def async_save_snapshot(
+    store: Store[dict[str, Any]],
+    client: InvertechsClient,
+    entry: ConfigEntry,
+    entry_data: dict[str, Any],
+) -> None:
+    """Write the token and cached coordinator data now."""
+    await store.async_save(_snapshot_data(client, entry, entry_data))
+
+
+def _snapshot_data(
+    client: InvertechsClient,
+    entry: ConfigEntry,
+    entry_data: dict[str, Any],
+) -> dict[str, Any]:
+    return {
+        "email": entry.data[CONF_EMAIL].lower(),
+        "region": client.region,
+        "token": client.token,
+        "fast": plants_to_json(entry_data.get("cached_fast_data")),
+        "devices": plants_to_json(entry_data.get("cached_device_data")),
+    }